@@ -4,11 +4,11 @@ from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 from cookbook.models import Base
-from settings import settings
+from settings import get_settings
 
 
 def get_url():
-    url = settings.sqlalchemy_url
+    url = get_settings().sqlalchemy_url
     if not url:
         raise ValueError("URL not found")
     return url
@@ -29,6 +29,18 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+# objects managed only by hand-written migrations (Postgres-specific search)
+MANUAL_OBJECTS = {
+    "search_vector",
+    "ix_recipes_search_vector",
+    "ix_ingredients_name_trgm",
+}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return name not in MANUAL_OBJECTS
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +65,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -75,7 +88,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,43 @@
+"""add recipes full text search
+
+Revision ID: 9d2a6f0c5b17
+Revises: 4c1e8b2f9a31
+Create Date: 2026-10-18 13:02:19.554870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2a6f0c5b17"
+down_revision: Union[str, Sequence[str], None] = "4c1e8b2f9a31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        ALTER TABLE recipes ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        "ix_recipes_search_vector",
+        "recipes",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_recipes_search_vector", table_name="recipes")
+    op.drop_column("recipes", "search_vector")
@@ -0,0 +1,35 @@
+"""add ingredients name trigram index
+
+Revision ID: b83f5e1d4c62
+Revises: 9d2a6f0c5b17
+Create Date: 2026-10-18 13:48:05.117302
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b83f5e1d4c62"
+down_revision: Union[str, Sequence[str], None] = "9d2a6f0c5b17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_ingredients_name_trgm",
+        "ingredients",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_ingredients_name_trgm", table_name="ingredients")
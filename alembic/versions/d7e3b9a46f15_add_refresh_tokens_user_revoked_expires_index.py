@@ -0,0 +1,38 @@
+"""add refresh_tokens user/revoked/expires index
+
+Revision ID: d7e3b9a46f15
+Revises: c5a9e7f21d08
+Create Date: 2026-10-18 16:05:11.472903
+
+Партиционирование refresh_tokens по expires_at здесь не делаем: в Postgres
+уникальный индекс на партиционированной таблице обязан включать ключ
+партиционирования, и глобальная уникальность token потерялась бы. Рост
+таблицы ограничивает пакетная очистка (cookbook.cli.sweep_refresh_tokens).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e3b9a46f15"
+down_revision: Union[str, Sequence[str], None] = "c5a9e7f21d08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_refresh_tokens_user_id_revoked_expires_at",
+        "refresh_tokens",
+        ["user_id", "revoked", "expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_refresh_tokens_user_id_revoked_expires_at", table_name="refresh_tokens"
+    )
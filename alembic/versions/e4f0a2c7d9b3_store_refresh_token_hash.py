@@ -0,0 +1,57 @@
+"""store refresh token hash
+
+Revision ID: e4f0a2c7d9b3
+Revises: d7e3b9a46f15
+Create Date: 2026-10-18 16:48:27.019554
+
+Вместо самого токена храним sha256 от него. Откат не может восстановить
+исходные значения, поэтому удаляет все refresh-токены: пользователям
+придётся войти заново.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e4f0a2c7d9b3"
+down_revision: Union[str, Sequence[str], None] = "d7e3b9a46f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "refresh_tokens",
+        sa.Column("token_hash", sa.LargeBinary(length=32), nullable=True),
+    )
+    # Тот же хэш, что считает hash_refresh_token
+    op.execute(
+        "UPDATE refresh_tokens SET token_hash = sha256(convert_to(token, 'UTF8'))"
+    )
+    op.alter_column("refresh_tokens", "token_hash", nullable=False)
+    op.create_index(
+        op.f("ix_refresh_tokens_token_hash"),
+        "refresh_tokens",
+        ["token_hash"],
+        unique=True,
+    )
+    op.drop_index(op.f("ix_refresh_tokens_token"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column(
+        "refresh_tokens",
+        sa.Column("token", sa.String(length=128), nullable=False),
+    )
+    op.create_index(
+        op.f("ix_refresh_tokens_token"), "refresh_tokens", ["token"], unique=True
+    )
+    op.drop_index(op.f("ix_refresh_tokens_token_hash"), table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token_hash")
@@ -0,0 +1,45 @@
+"""add refresh_tokens sweep indexes
+
+Revision ID: f1c8d2a5b7e9
+Revises: e4f0a2c7d9b3
+Create Date: 2026-10-18 18:12:40.218431
+
+Очистка не ограничивает user_id, поэтому составной индекс
+(user_id, revoked, expires_at) ей не подходит. Просроченные токены ищутся
+по expires_at, отозванные - по частичному индексу только из них.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c8d2a5b7e9"
+down_revision: Union[str, Sequence[str], None] = "e4f0a2c7d9b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_refresh_tokens_expires_at",
+        "refresh_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_refresh_tokens_revoked",
+        "refresh_tokens",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("revoked"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_refresh_tokens_revoked", table_name="refresh_tokens")
+    op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens")
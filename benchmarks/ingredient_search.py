@@ -0,0 +1,113 @@
+"""Поиск рецептов по набору ингредиентов на растущей таблице recipe_ingredients.
+
+python -m benchmarks.ingredient_search --sizes 100000 300000 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from cookbook.models import Base, Ingredient, Recipe, RecipeIngredient, User
+from cookbook.repositories.recipe_repository import RecipeRepository
+
+INGREDIENTS_PER_RECIPE = 10
+# Размер каталога ингредиентов растёт вместе с числом рецептов,
+# как в реальном каталоге
+RECIPES_PER_INGREDIENT = 50
+BATCH = 50_000
+INDEX_NAME = "ix_recipe_ingredients_ingredient_id_recipe_id"
+
+
+async def seed(engine, rows: int, rng: random.Random) -> int:
+    recipes = rows // INGREDIENTS_PER_RECIPE
+    ingredients = max(recipes // RECIPES_PER_INGREDIENT, INGREDIENTS_PER_RECIPE)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User.__table__),
+            [{"email": "bench@example.com", "name": "bench", "password_hash": "-"}],
+        )
+        await conn.execute(
+            insert(Ingredient.__table__),
+            [{"name": f"ingredient {i}"} for i in range(ingredients)],
+        )
+        for start in range(0, recipes, BATCH):
+            count = min(BATCH, recipes - start)
+            await conn.execute(
+                insert(Recipe.__table__),
+                [
+                    {"title": f"recipe {start + i}", "description": "", "owner_id": 1}
+                    for i in range(count)
+                ],
+            )
+            links = [
+                {"recipe_id": start + i + 1, "ingredient_id": ingredient_id}
+                for i in range(count)
+                for ingredient_id in rng.sample(
+                    range(1, ingredients + 1), INGREDIENTS_PER_RECIPE
+                )
+            ]
+            await conn.execute(insert(RecipeIngredient.__table__), links)
+        await conn.execute(text("ANALYZE"))
+    return ingredients
+
+
+async def measure(session_factory, names, match_all: bool, repeat: int) -> float:
+    samples = []
+    async with session_factory() as db:
+        await RecipeRepository.search_by_ingredients(db, names, match_all, 20)
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await RecipeRepository.search_by_ingredients(db, names, match_all, 20)
+            samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+async def run_size(rows: int, repeat: int, seed_value: int) -> dict:
+    rng = random.Random(seed_value)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        ingredients = await seed(engine, rows, rng)
+        session_factory = async_sessionmaker(bind=engine, class_=AsyncSession)
+        names = [f"ingredient {i}" for i in rng.sample(range(ingredients), 2)]
+
+        result = {"association_rows": rows, "ingredients": ingredients}
+        for label in ("with_index", "without_index"):
+            result[label] = {
+                "all_ms": await measure(session_factory, names, True, repeat),
+                "any_ms": await measure(session_factory, names, False, repeat),
+            }
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+
+        await engine.dispose()
+    return result
+
+
+async def run(sizes: list[int], repeat: int, seed_value: int) -> list[dict]:
+    return [await run_size(rows, repeat, seed_value) for rows in sizes]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100_000, 300_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    results = asyncio.run(run(args.sizes, args.repeat, args.seed))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Пропускная способность защищённого маршрута (/auth/me) с кэшем
+проверенных JWT и без него.
+
+    python -m benchmarks.jwt_auth --requests 5000
+    python -m benchmarks.jwt_auth --requests 5000 --no-cache
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import Timer, percentiles, sqlite_app
+from cookbook.core import security
+from cookbook.core.cache import NullCache
+from cookbook.models import User
+from settings import get_settings
+
+
+async def worker(client, headers: list[dict], count: int, latencies: list[float]):
+    for i in range(count):
+        started = time.perf_counter()
+        response = await client.get("/auth/me", headers=headers[i % len(headers)])
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+
+
+async def run(requests: int, users: int, concurrency: int, cache: bool) -> dict:
+    if not cache:
+        null_cache = NullCache()
+        security.get_token_cache = lambda: null_cache
+
+    async with sqlite_app() as (client, session_factory):
+        async with session_factory() as db:
+            db.add_all(
+                User(email=f"user{i}@example.com", name=f"user{i}", password_hash="-")
+                for i in range(users)
+            )
+            await db.commit()
+
+        headers = [
+            {"Authorization": f"Bearer {security.create_access_token(i + 1)}"}
+            for i in range(users)
+        ]
+        # Прогрев: пользователи попадают в user_cache, токены - в token_cache
+        await worker(client, headers, users, [])
+
+        latencies: list[float] = []
+        per_worker = requests // concurrency
+        with Timer() as timer:
+            await asyncio.gather(
+                *(
+                    worker(client, headers, per_worker, latencies)
+                    for _ in range(concurrency)
+                )
+            )
+
+    return {
+        "jwt_backend": get_settings().jwt_backend,
+        "token_cache": cache,
+        "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / timer.elapsed, 2),
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="проверять подпись JWT на каждом запросе",
+    )
+    args = parser.parse_args()
+    result = asyncio.run(
+        run(args.requests, args.users, args.concurrency, not args.no_cache)
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Пропускная способность /auth/login и задержка остальных запросов во время
+всплеска логинов.
+
+    python -m benchmarks.login --logins 40 --blocking
+    python -m benchmarks.login --logins 40
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import Timer, percentiles, sqlite_app
+from cookbook.core import security
+from cookbook.models import User
+from cookbook.services import user_service
+from settings import get_settings
+
+PASSWORD = "bench_password"
+
+
+async def blocking_verify_password(password: str, hashed: str) -> bool:
+    return security.verify_password(password, hashed)
+
+
+async def probe(client, stop: asyncio.Event, latencies: list[float]) -> None:
+    interval = 0.005
+    while not stop.is_set():
+        # Задержка считается от момента, когда запрос должен был уйти:
+        # так в неё попадает и время, пока event loop был заблокирован
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        await client.get("/health/db")
+        latencies.append(time.perf_counter() - scheduled)
+
+
+async def run(logins: int, probes: int, blocking: bool) -> dict:
+    if blocking:
+        user_service.verify_password_async = blocking_verify_password
+
+    async with sqlite_app() as (client, session_factory):
+        async with session_factory() as db:
+            db.add(
+                User(
+                    email="bench@example.com",
+                    name="bench",
+                    password_hash=security.hash_password(PASSWORD),
+                )
+            )
+            await db.commit()
+
+        stop = asyncio.Event()
+        latencies: list[float] = []
+        probe_tasks = [
+            asyncio.create_task(probe(client, stop, latencies)) for _ in range(probes)
+        ]
+
+        form = {"username": "bench@example.com", "password": PASSWORD}
+        with Timer() as timer:
+            responses = await asyncio.gather(
+                *(client.post("/auth/login", data=form) for _ in range(logins))
+            )
+
+        stop.set()
+        await asyncio.gather(*probe_tasks)
+
+    assert all(response.status_code == 200 for response in responses)
+    return {
+        "mode": "blocking" if blocking else "executor",
+        "bcrypt_rounds": get_settings().bcrypt_rounds,
+        "password_hash_workers": get_settings().password_hash_workers,
+        "logins": logins,
+        "logins_per_second": round(logins / timer.elapsed, 2),
+        "probe_requests": len(latencies),
+        "probe_latency_ms": percentiles(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="проверять пароль прямо в event loop, как раньше",
+    )
+    args = parser.parse_args()
+    result = asyncio.run(run(args.logins, args.probes, args.blocking))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Нагрузочный прогон всех маршрутов на временной SQLite-базе.
+
+    python -m benchmarks.run --recipes 10000 --requests 2000 --output before.json
+    python -m benchmarks.run --only recipes_list recipe_get
+
+Результат - JSON с RPS, p50/p95/p99 и числом SQL-запросов на HTTP-запрос
+по каждому сценарию; файлы разных коммитов удобно сравнивать между собой.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from benchmarks.common import Timer, percentiles, sqlite_app
+from benchmarks.seed import PASSWORD, WORDS, Scale, seed
+from cookbook.core.metrics import instrument_engine, metrics
+from cookbook.core.security import create_access_token
+
+
+@dataclass
+class Context:
+    client: httpx.AsyncClient
+    scale: Scale
+    rng: random.Random
+    auth_headers: list[dict] = field(default_factory=list)
+    refresh_tokens: list[str] = field(default_factory=list)
+
+    def recipe_id(self) -> int:
+        return self.rng.randint(1, self.scale.recipes)
+
+    def ingredient_name(self) -> str:
+        return f"ingredient {self.rng.randrange(self.scale.ingredients)}"
+
+    def auth(self) -> dict:
+        return self.rng.choice(self.auth_headers)
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str
+    call: Callable[[Context, int], Awaitable[httpx.Response]]
+    # Доля от --requests: логин упирается в bcrypt и гоняется меньше
+    share: float = 1.0
+
+
+async def recipes_list(ctx: Context, worker: int) -> httpx.Response:
+    return await ctx.client.get("/recipes", params={"limit": 20})
+
+
+async def recipe_get(ctx: Context, worker: int) -> httpx.Response:
+    return await ctx.client.get(f"/recipes/{ctx.recipe_id()}")
+
+
+async def recipes_search(ctx: Context, worker: int) -> httpx.Response:
+    return await ctx.client.get("/recipes/search", params={"q": ctx.rng.choice(WORDS)})
+
+
+async def recipes_by_ingredients(ctx: Context, worker: int) -> httpx.Response:
+    names = [ctx.ingredient_name(), ctx.ingredient_name()]
+    return await ctx.client.get(
+        "/recipes/by-ingredients", params={"name": names, "mode": "any"}
+    )
+
+
+async def ingredients_list(ctx: Context, worker: int) -> httpx.Response:
+    return await ctx.client.get("/ingredients")
+
+
+async def ingredients_suggest(ctx: Context, worker: int) -> httpx.Response:
+    prefix = f"ingredient {ctx.rng.randrange(10)}"
+    return await ctx.client.get("/ingredients/suggest", params={"q": prefix})
+
+
+async def auth_me(ctx: Context, worker: int) -> httpx.Response:
+    return await ctx.client.get("/auth/me", headers=ctx.auth())
+
+
+async def auth_refresh(ctx: Context, worker: int) -> httpx.Response:
+    # У каждого воркера своя цепочка: новый токен заменяет использованный
+    response = await ctx.client.post(
+        "/auth/refresh", json={"refresh_token": ctx.refresh_tokens[worker]}
+    )
+    if response.status_code == 200:
+        ctx.refresh_tokens[worker] = response.json()["refresh_token"]
+    return response
+
+
+async def auth_login(ctx: Context, worker: int) -> httpx.Response:
+    user = ctx.rng.randrange(ctx.scale.users)
+    form = {"username": f"user{user}@example.com", "password": PASSWORD}
+    return await ctx.client.post("/auth/login", data=form)
+
+
+async def recipe_create(ctx: Context, worker: int) -> httpx.Response:
+    payload = {
+        "title": f"bench {ctx.rng.random()}",
+        "description": " ".join(ctx.rng.choices(WORDS, k=12)),
+        "ingredients": [{"name": ctx.ingredient_name()} for _ in range(3)],
+    }
+    return await ctx.client.post("/recipes", json=payload, headers=ctx.auth())
+
+
+SCENARIOS = [
+    Scenario("recipes_list", "GET", "/recipes", recipes_list),
+    Scenario("recipe_get", "GET", "/recipes/{recipe_id}", recipe_get),
+    Scenario("recipes_search", "GET", "/recipes/search", recipes_search),
+    Scenario(
+        "recipes_by_ingredients",
+        "GET",
+        "/recipes/by-ingredients",
+        recipes_by_ingredients,
+    ),
+    Scenario("ingredients_list", "GET", "/ingredients", ingredients_list),
+    Scenario("ingredients_suggest", "GET", "/ingredients/suggest", ingredients_suggest),
+    Scenario("auth_me", "GET", "/auth/me", auth_me),
+    # Пишущие сценарии в конце, чтобы не влиять на чтение
+    Scenario("auth_refresh", "POST", "/auth/refresh", auth_refresh),
+    Scenario("recipe_create", "POST", "/recipes", recipe_create),
+    Scenario("auth_login", "POST", "/auth/login", auth_login, share=0.02),
+]
+
+
+async def drive(ctx: Context, scenario: Scenario, requests: int, concurrency: int):
+    latencies: list[float] = []
+    errors = 0
+    per_worker = max(int(requests * scenario.share) // concurrency, 1)
+
+    async def worker(index: int) -> None:
+        nonlocal errors
+        for _ in range(per_worker):
+            started = time.perf_counter()
+            response = await scenario.call(ctx, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries = metrics.request_queries.get((scenario.method, scenario.route))
+    before = (queries.sum, queries.count) if queries is not None else (0, 0)
+
+    with Timer() as timer:
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    queries = metrics.request_queries.get((scenario.method, scenario.route))
+    after = (queries.sum, queries.count) if queries is not None else (0, 0)
+    counted = after[1] - before[1]
+
+    return {
+        "scenario": scenario.name,
+        "route": f"{scenario.method} {scenario.route}",
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / timer.elapsed, 2),
+        "latency_ms": percentiles(latencies),
+        "queries_per_request": (
+            round((after[0] - before[0]) / counted, 2) if counted else None
+        ),
+    }
+
+
+async def run(
+    scale: Scale, requests: int, concurrency: int, only: list[str], seed_value: int
+) -> dict:
+    rng = random.Random(seed_value)
+    scenarios = [s for s in SCENARIOS if not only or s.name in only]
+    scale.refresh_tokens = concurrency
+
+    async with sqlite_app() as (client, session_factory):
+        instrument_engine(session_factory.kw["bind"])
+        with Timer() as seeding:
+            refresh_tokens = await seed(session_factory, scale, rng)
+
+        ctx = Context(client=client, scale=scale, rng=rng)
+        ctx.auth_headers = [
+            {"Authorization": f"Bearer {create_access_token(user_id)}"}
+            for user_id in range(1, scale.users + 1)
+        ]
+        ctx.refresh_tokens = refresh_tokens
+
+        results = [
+            await drive(ctx, scenario, requests, concurrency) for scenario in scenarios
+        ]
+
+    return {
+        "scale": asdict(scale),
+        "requests": requests,
+        "concurrency": concurrency,
+        "seed_seconds": round(seeding.elapsed, 2),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=Scale.users)
+    parser.add_argument("--ingredients", type=int, default=Scale.ingredients)
+    parser.add_argument("--recipes", type=int, default=Scale.recipes)
+    parser.add_argument(
+        "--ingredients-per-recipe", type=int, default=Scale.ingredients_per_recipe
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        default=[],
+        choices=[scenario.name for scenario in SCENARIOS],
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="записать JSON в файл")
+    args = parser.parse_args()
+
+    scale = Scale(
+        users=args.users,
+        ingredients=args.ingredients,
+        recipes=args.recipes,
+        ingredients_per_recipe=args.ingredients_per_recipe,
+    )
+    result = asyncio.run(
+        run(scale, args.requests, args.concurrency, args.only, args.seed)
+    )
+    report = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Генератор данных для нагрузочных тестов."""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from cookbook.core.security import hash_password, hash_refresh_token
+from cookbook.models import Ingredient, Recipe, RecipeIngredient, User
+from cookbook.models.refresh_token import RefreshToken
+
+PASSWORD = "bench_password"
+BATCH = 10_000
+WORDS = (
+    "суп борщ салат пирог каша омлет плов рагу соус торт "
+    "soup salad pie stew sauce cake bread pasta curry roast"
+).split()
+
+
+@dataclass
+class Scale:
+    users: int = 100
+    ingredients: int = 1_000
+    recipes: int = 10_000
+    ingredients_per_recipe: int = 8
+    refresh_tokens: int = 0
+
+
+def _batches(rows: list[dict]):
+    for start in range(0, len(rows), BATCH):
+        yield rows[start : start + BATCH]
+
+
+async def seed(session_factory, scale: Scale, rng: random.Random) -> list[str]:
+    """Наполняет базу и возвращает значения выданных refresh-токенов."""
+    # Один хеш на всех: bcrypt на каждого пользователя занял бы минуты
+    password_hash = hash_password(PASSWORD)
+    refresh_values = [f"bench-refresh-{i}" for i in range(scale.refresh_tokens)]
+    expires_at = datetime.utcnow() + timedelta(days=1)
+
+    async with session_factory() as db:
+        await db.execute(
+            insert(User.__table__),
+            [
+                {
+                    "email": f"user{i}@example.com",
+                    "name": f"user{i}",
+                    "password_hash": password_hash,
+                }
+                for i in range(scale.users)
+            ],
+        )
+        await db.execute(
+            insert(Ingredient.__table__),
+            [{"name": f"ingredient {i}"} for i in range(scale.ingredients)],
+        )
+
+        recipes = [
+            {
+                "title": f"{rng.choice(WORDS)} {i}",
+                "description": " ".join(rng.choices(WORDS, k=12)),
+                "owner_id": rng.randint(1, scale.users),
+            }
+            for i in range(scale.recipes)
+        ]
+        for batch in _batches(recipes):
+            await db.execute(insert(Recipe.__table__), batch)
+
+        per_recipe = min(scale.ingredients_per_recipe, scale.ingredients)
+        links = [
+            {"recipe_id": recipe_id, "ingredient_id": ingredient_id}
+            for recipe_id in range(1, scale.recipes + 1)
+            for ingredient_id in rng.sample(range(1, scale.ingredients + 1), per_recipe)
+        ]
+        for batch in _batches(links):
+            await db.execute(insert(RecipeIngredient.__table__), batch)
+
+        if refresh_values:
+            await db.execute(
+                insert(RefreshToken.__table__),
+                [
+                    {
+                        "token_hash": hash_refresh_token(value),
+                        "user_id": i % scale.users + 1,
+                        "expires_at": expires_at,
+                        "revoked": False,
+                        "created_at": datetime.utcnow(),
+                    }
+                    for i, value in enumerate(refresh_values)
+                ],
+            )
+        await db.commit()
+    return refresh_values
@@ -0,0 +1,125 @@
+"""Сериализация страницы рецептов: ORM + Pydantic против кортежей + orjson.
+
+python -m benchmarks.serialization --recipes 10000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from cookbook.core.cache import get_recipe_cache
+from cookbook.models import Base, Ingredient, Recipe, RecipeIngredient, User
+from cookbook.schemas.recipe import RecipePage
+from cookbook.services.recipe_service import get_recipes_page_json
+
+INGREDIENTS = 200
+INGREDIENTS_PER_RECIPE = 5
+
+# Так ответ проверяет и сериализует FastAPI при response_model=RecipePage
+page_adapter = TypeAdapter(RecipePage)
+
+
+async def seed(engine, recipes: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(User.__table__),
+            [{"email": "bench@example.com", "name": "bench", "password_hash": "-"}],
+        )
+        await conn.execute(
+            insert(Ingredient.__table__),
+            [{"name": f"ingredient {i}"} for i in range(INGREDIENTS)],
+        )
+        await conn.execute(
+            insert(Recipe.__table__),
+            [
+                {"title": f"recipe {i}", "description": "описание " * 5, "owner_id": 1}
+                for i in range(recipes)
+            ],
+        )
+        await conn.execute(
+            insert(RecipeIngredient.__table__),
+            [
+                {
+                    "recipe_id": i + 1,
+                    "ingredient_id": (i + k) % INGREDIENTS + 1,
+                }
+                for i in range(recipes)
+                for k in range(INGREDIENTS_PER_RECIPE)
+            ],
+        )
+
+
+async def orm_path(db: AsyncSession, limit: int) -> bytes:
+    # Прежний путь: ORM-объекты с ингредиентами через selectinload
+    stmt = (
+        select(Recipe)
+        .options(selectinload(Recipe.ingredients))
+        .order_by(Recipe.id)
+        .limit(limit)
+    )
+    recipes = (await db.execute(stmt)).scalars().unique().all()
+    page = RecipePage.model_validate({"items": recipes, "next_cursor": None})
+    # Ответ валидируется ещё раз по response_model и только потом кодируется
+    return page_adapter.dump_json(page_adapter.validate_python(page))
+
+
+async def fast_path(db: AsyncSession, limit: int) -> bytes:
+    return await get_recipes_page_json(db, limit)
+
+
+async def measure(session_factory, path, limit: int, repeat: int) -> dict:
+    samples, size = [], 0
+    for _ in range(repeat + 1):
+        await get_recipe_cache().clear()
+        # Новая сессия на каждый прогон, как на каждый запрос
+        async with session_factory() as db:
+            started = time.perf_counter()
+            body = await path(db, limit)
+            samples.append(time.perf_counter() - started)
+            size = len(body)
+    # Первый прогон прогревает соединение и кэш операторов
+    return {
+        "median_ms": round(statistics.median(samples[1:]) * 1000, 3),
+        "bytes": size,
+    }
+
+
+async def run(recipes: int, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        await seed(engine, recipes)
+        session_factory = async_sessionmaker(
+            bind=engine, class_=AsyncSession, expire_on_commit=False
+        )
+        result = {
+            "recipes": recipes,
+            "orm_pydantic": await measure(session_factory, orm_path, recipes, repeat),
+            "tuples_orjson": await measure(session_factory, fast_path, recipes, repeat),
+        }
+        await engine.dispose()
+    result["speedup"] = round(
+        result["orm_pydantic"]["median_ms"] / result["tuples_orjson"]["median_ms"], 2
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.recipes, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
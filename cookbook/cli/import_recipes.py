@@ -0,0 +1,56 @@
+"""Массовый импорт рецептов из NDJSON-файла.
+
+python -m cookbook.cli.import_recipes recipes.ndjson --owner-email admin@example.com
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO
+
+from cookbook.core.database import dispose_engines, get_sessionmaker
+from cookbook.repositories.user_repository import UserRepository
+from cookbook.services.recipe_service import import_recipes_service
+from settings import get_settings
+
+READ_SIZE = 1024 * 1024
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    while chunk := file.read(READ_SIZE):
+        yield chunk
+
+
+async def run(file: BinaryIO, owner_email: str, chunk_size: int) -> int:
+    async with get_sessionmaker()() as db:
+        owner = await UserRepository.get_by_email(db, owner_email)
+        if owner is None:
+            print(f"Пользователь '{owner_email}' не найден", file=sys.stderr)
+            return 1
+
+        report = await import_recipes_service(read_chunks(file), db, owner, chunk_size)
+
+    await dispose_engines()
+    print(report.model_dump_json(indent=2))
+    return 0 if report.failed == 0 else 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Импорт рецептов из NDJSON")
+    parser.add_argument("path", help="путь к NDJSON-файлу или '-' для stdin")
+    parser.add_argument("--owner-email", required=True)
+    parser.add_argument(
+        "--chunk-size", type=int, default=get_settings().import_chunk_size
+    )
+    args = parser.parse_args()
+
+    if args.path == "-":
+        code = asyncio.run(run(sys.stdin.buffer, args.owner_email, args.chunk_size))
+    else:
+        with open(args.path, "rb") as file:
+            code = asyncio.run(run(file, args.owner_email, args.chunk_size))
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Запуск API в production: несколько процессов uvicorn на всех ядрах.
+
+python -m cookbook.cli.serve --workers 8
+"""
+
+import argparse
+import os
+
+from settings import get_settings
+
+
+def server_options(workers: int | None = None) -> dict:
+    settings = get_settings()
+    return {
+        "host": settings.server_host,
+        "port": settings.server_port,
+        "workers": workers or settings.server_workers or os.cpu_count() or 1,
+        "loop": settings.server_loop,
+        "http": settings.server_http,
+        "backlog": settings.server_backlog,
+        "timeout_keep_alive": settings.server_keep_alive_seconds,
+        # По SIGTERM воркер перестаёт принимать соединения и ждёт текущие
+        # запросы не дольше этого времени, затем lifespan закрывает пулы
+        "timeout_graceful_shutdown": settings.server_graceful_shutdown_seconds,
+        "proxy_headers": True,
+        "access_log": False,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Запуск Cookbook API")
+    parser.add_argument("--workers", type=int, help="по умолчанию число ядер")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    # Каждый воркер импортирует приложение сам и создаёт свой пул соединений
+    uvicorn.run(
+        "cookbook.main:create_app", factory=True, **server_options(args.workers)
+    )
+
+
+if __name__ == "__main__":
+    main()
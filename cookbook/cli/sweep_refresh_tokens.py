@@ -0,0 +1,33 @@
+"""Удаление отозванных и просроченных refresh-токенов.
+
+python -m cookbook.cli.sweep_refresh_tokens --batch-size 5000
+"""
+
+import argparse
+import asyncio
+import json
+
+from cookbook.core.database import dispose_engines, get_sessionmaker
+from cookbook.services.user_service import sweep_refresh_tokens
+from settings import get_settings
+
+
+async def run(batch_size: int) -> int:
+    async with get_sessionmaker()() as db:
+        deleted = await sweep_refresh_tokens(db, batch_size)
+    await dispose_engines()
+    return deleted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Очистка refresh-токенов")
+    parser.add_argument(
+        "--batch-size", type=int, default=get_settings().refresh_token_sweep_batch_size
+    )
+    args = parser.parse_args()
+    deleted = asyncio.run(run(args.batch_size))
+    print(json.dumps({"deleted": deleted}))
+
+
+if __name__ == "__main__":
+    main()
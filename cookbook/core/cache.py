@@ -0,0 +1,167 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+
+from settings import get_settings
+
+
+class CacheBackend(ABC):
+    """Кэш сериализованных значений (bytes) с ограниченным временем жизни."""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None: ...
+
+    @abstractmethod
+    async def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+
+class NullCache(CacheBackend):
+    """Кэш, который ничего не хранит."""
+
+    def __init__(self):
+        self.misses = 0
+
+    async def get(self, key: str) -> bytes | None:
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def delete_prefix(self, prefix: str) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "hits": 0,
+            "misses": self.misses,
+            "evictions": 0,
+            "entries": 0,
+            "bytes": 0,
+        }
+
+
+class InMemoryCache(CacheBackend):
+    """LRU-кэш в памяти процесса с TTL и лимитами по числу записей и объёму."""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._pop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self._pop(key)
+        if len(value) > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._bytes += len(value)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._pop(oldest)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._pop(key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._pop(key)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+
+def create_cache(ttl: float, max_entries: int, max_bytes: int) -> CacheBackend:
+    if not get_settings().cache_enabled:
+        return NullCache()
+    return InMemoryCache(ttl=ttl, max_entries=max_entries, max_bytes=max_bytes)
+
+
+# Кэши создаются при первом обращении: их размеры берутся из настроек,
+# а настройки не должны читаться при импорте
+@lru_cache
+def get_recipe_cache() -> CacheBackend:
+    return create_cache(
+        ttl=get_settings().cache_ttl_seconds,
+        max_entries=get_settings().cache_max_entries,
+        max_bytes=get_settings().cache_max_bytes,
+    )
+
+
+@lru_cache
+def get_user_cache() -> CacheBackend:
+    return create_cache(
+        ttl=get_settings().user_cache_ttl_seconds,
+        max_entries=get_settings().user_cache_max_entries,
+        max_bytes=get_settings().cache_max_bytes,
+    )
+
+
+# Проверенные claims access-токенов, ключ - сам токен. TTL каждой записи
+# задаётся по exp токена
+@lru_cache
+def get_token_cache() -> CacheBackend:
+    return create_cache(
+        ttl=get_settings().jwt_expire_minutes * 60,
+        max_entries=get_settings().jwt_cache_max_entries,
+        max_bytes=get_settings().cache_max_bytes,
+    )
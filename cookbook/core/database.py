@@ -1,24 +1,247 @@
+import os
+import time
+from contextlib import AsyncExitStack
+from functools import lru_cache
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from settings import settings
+from settings import get_settings
 
-DATABASE_URL = settings.database_url
 
-async_engine = create_async_engine(DATABASE_URL)
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Пул соединений, который считает ожидающих свободного соединения."""
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=async_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autoflush=False,
-)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+
+    def _do_get(self):
+        self.waiters += 1
+        try:
+            return super()._do_get()
+        finally:
+            self.waiters -= 1
+
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    settings = get_settings()
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["statement_cache_size"] = settings.db_statement_cache_size
+        if settings.db_command_timeout is not None:
+            connect_args["command_timeout"] = settings.db_command_timeout
+
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+class PrimarySession(Session):
+    """Сессия основной базы: запоминает время последней записи."""
+
+
+def _instrumented(engine: AsyncEngine) -> AsyncEngine:
+    if get_settings().metrics_enabled:
+        from cookbook.core.metrics import instrument_engine
+
+        instrument_engine(engine)
+    return engine
+
+
+# Движки и фабрики сессий создаются при первом обращении: импорт модуля
+# не тянет драйвер базы и не читает настройки
+
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return _instrumented(create_engine_from_settings(get_settings().database_url))
+
+
+@lru_cache
+def get_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(
+        bind=get_engine(),
+        class_=AsyncSession,
+        sync_session_class=PrimarySession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+@lru_cache
+def get_read_engine() -> AsyncEngine | None:
+    url = get_settings().replica_database_url
+    if not url:
+        return None
+    return _instrumented(create_engine_from_settings(url))
+
+
+@lru_cache
+def get_read_sessionmaker() -> async_sessionmaker | None:
+    read_engine = get_read_engine()
+    if read_engine is None:
+        return None
+    return async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+def get_engines() -> dict[str, AsyncEngine]:
+    engines = {"primary": get_engine()}
+    if (read_engine := get_read_engine()) is not None:
+        engines["replica"] = read_engine
+    return engines
+
+
+def _created_engines() -> list[AsyncEngine]:
+    # Только уже созданные движки: закрытие не должно создавать новые
+    return [
+        engine
+        for getter in (get_engine, get_read_engine)
+        if getter.cache_info().currsize and (engine := getter()) is not None
+    ]
+
+
+async def dispose_engines() -> None:
+    for engine in _created_engines():
+        await engine.dispose()
+
+
+def _reset_engines_after_fork() -> None:
+    # Соединения пула принадлежат родителю: дочерний процесс их не закрывает
+    # и не использует, а создаёт свой движок при первом обращении
+    for engine in _created_engines():
+        engine.sync_engine.dispose(close=False)
+    for getter in (
+        get_engine,
+        get_sessionmaker,
+        get_read_engine,
+        get_read_sessionmaker,
+    ):
+        getter.cache_clear()
+
+
+os.register_at_fork(after_in_child=_reset_engines_after_fork)
+
+
+_last_write_at = float("-inf")
+_replica_unavailable_until = float("-inf")
+
+
+def mark_primary_write() -> None:
+    global _last_write_at
+    _last_write_at = time.monotonic()
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flush_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _dml_wrote(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _commit_wrote(session):
+    if session.info.pop("wrote", False):
+        mark_primary_write()
+
+
+def _read_sessionmaker() -> async_sessionmaker:
+    primary = get_sessionmaker()
+    replica = get_read_sessionmaker()
+    if replica is None:
+        return primary
+
+    now = time.monotonic()
+    # Реплика может отставать: сразу после записи читаем с основной базы
+    if now - _last_write_at < get_settings().replica_lag_tolerance_seconds:
+        return primary
+    if now < _replica_unavailable_until:
+        return primary
+    return replica
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as db:
+    async with get_sessionmaker()() as db:
         try:
             yield db
         finally:
             await db.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    global _replica_unavailable_until
+
+    session_factory = _read_sessionmaker()
+    db = session_factory()
+    if session_factory is not get_sessionmaker():
+        try:
+            await db.connection()
+        except (OSError, DBAPIError):
+            await db.close()
+            _replica_unavailable_until = (
+                time.monotonic() + get_settings().replica_retry_seconds
+            )
+            db = get_sessionmaker()()
+
+    async with db:
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
+def get_pool_stats(engine: AsyncEngine | None = None) -> dict:
+    pool = (engine or get_engine()).pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "waiters": getattr(pool, "waiters", 0),
+    }
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Открывает соединения заранее, чтобы первые запросы не ждали подключения."""
+    async with AsyncExitStack() as stack:
+        # Держим все соединения открытыми одновременно, иначе пул выдаст одно
+        for _ in range(connections):
+            conn = await stack.enter_async_context(engine.connect())
+            await conn.execute(text("SELECT 1"))
+
+
+def dialect_insert(db: AsyncSession, table):
+    """INSERT с поддержкой ON CONFLICT для диалекта текущей сессии."""
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
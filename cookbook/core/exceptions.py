@@ -14,3 +14,15 @@ class AuthenticationError(Exception):
     """Ошибка аутентификации"""
 
     pass
+
+
+class InvalidCursorError(Exception):
+    """Некорректный курсор пагинации."""
+
+    pass
+
+
+class InvalidTokenError(Exception):
+    """Токен не прошёл проверку подписи или срока действия."""
+
+    pass
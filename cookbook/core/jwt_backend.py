@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from cookbook.core.exceptions import InvalidTokenError
+from settings import get_settings
+
+
+class JWTBackend(ABC):
+    """Подпись и проверка JWT конкретной библиотекой."""
+
+    @abstractmethod
+    def encode(self, payload: dict, secret: str, algorithm: str) -> str: ...
+
+    @abstractmethod
+    def decode(self, token: str, secret: str, algorithms: list[str]) -> dict:
+        """Возвращает claims или бросает InvalidTokenError."""
+
+
+class JoseBackend(JWTBackend):
+    def __init__(self):
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, payload: dict, secret: str, algorithm: str) -> str:
+        return self._jwt.encode(payload, secret, algorithm=algorithm)
+
+    def decode(self, token: str, secret: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, secret, algorithms=algorithms)
+        except self._error as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+class PyJWTBackend(JWTBackend):
+    """PyJWT: проверка HS256 заметно быстрее python-jose. Ставится отдельно."""
+
+    def __init__(self):
+        try:
+            import jwt
+        except ImportError as e:
+            raise RuntimeError(
+                "Для JWT_BACKEND=pyjwt нужен пакет PyJWT: pip install pyjwt"
+            ) from e
+
+        self._jwt = jwt
+        self._error = jwt.PyJWTError
+
+    def encode(self, payload: dict, secret: str, algorithm: str) -> str:
+        return self._jwt.encode(payload, secret, algorithm=algorithm)
+
+    def decode(self, token: str, secret: str, algorithms: list[str]) -> dict:
+        try:
+            return self._jwt.decode(token, secret, algorithms=algorithms)
+        except self._error as e:
+            raise InvalidTokenError(str(e)) from e
+
+
+def create_jwt_backend(name: str) -> JWTBackend:
+    if name == "pyjwt":
+        return PyJWTBackend()
+    return JoseBackend()
+
+
+@lru_cache
+def get_jwt_backend() -> JWTBackend:
+    # Библиотека JWT импортируется при первой выдаче или проверке токена
+    return create_jwt_backend(get_settings().jwt_backend)
@@ -0,0 +1,238 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from cookbook.core.startup import WARMUP_SCOPE_KEY
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами в формате Prometheus."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def samples(self, name: str, labels: str) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RequestStats:
+    """SQL-запросы одного HTTP-запроса."""
+
+    __slots__ = ("method", "path", "queries", "db_time", "statements")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements: Counter[str] = Counter()
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+
+def render_metric(name: str, kind: str, help_text: str, lines: list[str]) -> str:
+    return "\n".join([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *lines])
+
+
+class Metrics:
+    def __init__(self):
+        self.request_latency: dict[tuple[str, str, int], Histogram] = {}
+        self.request_queries: dict[tuple[str, str], Histogram] = {}
+        self.request_db_time: dict[tuple[str, str], Histogram] = {}
+        self.queries_total = 0
+        self.db_seconds_total = 0.0
+        self.n_plus_one_total = 0
+
+    def observe_request(
+        self, method: str, route: str, status: int, elapsed: float, stats: RequestStats
+    ) -> None:
+        key = (method, route)
+        if (method, route, status) not in self.request_latency:
+            self.request_latency[(method, route, status)] = Histogram(LATENCY_BUCKETS)
+            self.request_queries.setdefault(key, Histogram(QUERY_BUCKETS))
+            self.request_db_time.setdefault(key, Histogram(LATENCY_BUCKETS))
+        self.request_latency[(method, route, status)].observe(elapsed)
+        self.request_queries[key].observe(stats.queries)
+        self.request_db_time[key].observe(stats.db_time)
+
+    def observe_query(self, statement: str, elapsed: float) -> None:
+        self.queries_total += 1
+        self.db_seconds_total += elapsed
+
+        stats = _request_stats.get()
+        if stats is None:
+            return
+        stats.queries += 1
+        stats.db_time += elapsed
+
+        threshold = get_settings().n_plus_one_threshold
+        if threshold <= 0:
+            return
+        stats.statements[statement] += 1
+        # Предупреждаем один раз на запрос, когда порог только превышен
+        if stats.statements[statement] == threshold + 1:
+            self.n_plus_one_total += 1
+            logger.warning(
+                "Возможный N+1: %s %s выполнил запрос больше %d раз: %s",
+                stats.method,
+                stats.path,
+                threshold,
+                " ".join(statement.split()),
+            )
+
+    def render(self) -> str:
+        latency, queries, db_time = [], [], []
+        for (method, route, status), histogram in self.request_latency.items():
+            labels = _labels(method=method, route=route, status=status)
+            latency += histogram.samples(
+                "cookbook_http_request_duration_seconds", labels
+            )
+        for (method, route), histogram in self.request_queries.items():
+            labels = _labels(method=method, route=route)
+            queries += histogram.samples("cookbook_http_request_db_queries", labels)
+            db_time += self.request_db_time[(method, route)].samples(
+                "cookbook_http_request_db_seconds", labels
+            )
+
+        return "\n".join(
+            [
+                render_metric(
+                    "cookbook_http_request_duration_seconds",
+                    "histogram",
+                    "Время обработки HTTP-запроса",
+                    latency,
+                ),
+                render_metric(
+                    "cookbook_http_request_db_queries",
+                    "histogram",
+                    "Число SQL-запросов на HTTP-запрос",
+                    queries,
+                ),
+                render_metric(
+                    "cookbook_http_request_db_seconds",
+                    "histogram",
+                    "Время в базе на HTTP-запрос",
+                    db_time,
+                ),
+                render_metric(
+                    "cookbook_db_queries_total",
+                    "counter",
+                    "Всего SQL-запросов",
+                    [f"cookbook_db_queries_total {self.queries_total}"],
+                ),
+                render_metric(
+                    "cookbook_db_seconds_total",
+                    "counter",
+                    "Всего времени в базе",
+                    [f"cookbook_db_seconds_total {self.db_seconds_total}"],
+                ),
+                render_metric(
+                    "cookbook_n_plus_one_total",
+                    "counter",
+                    "Запросы, в которых сработал детектор N+1",
+                    [f"cookbook_n_plus_one_total {self.n_plus_one_total}"],
+                ),
+            ]
+        )
+
+
+metrics = Metrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Время старта хранится в контексте выполнения, а не на соединении:
+    # при ошибке запроса after_cursor_execute не вызывается, и запись
+    # на соединении осталась бы там на всё время жизни соединения в пуле
+    if context is not None:
+        context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "query_started", None)
+    if started is not None:
+        metrics.observe_query(statement, time.perf_counter() - started)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    # Слушатели синхронного движка выполняются в greenlet той же задачи,
+    # поэтому видят RequestStats текущего запроса через contextvar
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: время ответа и SQL-запросы по маршрутам."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get(WARMUP_SCOPE_KEY):
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope["method"], scope["path"])
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            # Шаблон пути, а не сам путь: иначе id раздуют число меток
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code,
+                elapsed,
+                stats,
+            )
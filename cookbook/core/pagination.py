@@ -0,0 +1,26 @@
+import base64
+import binascii
+import json
+
+from cookbook.core.exceptions import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = data["id"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursorError("Некорректный курсор")
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorError("Некорректный курсор")
+    return last_id
@@ -0,0 +1,18 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON-ответ через orjson для маршрутов без response_model.
+
+    Маршруты с response_model FastAPI и так сериализует сразу в байты
+    через Pydantic, класс ответа на них не влияет.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+RESPONSE_CLASSES = {"json": JSONResponse, "orjson": ORJSONResponse}
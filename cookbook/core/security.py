@@ -1,70 +1,171 @@
+import asyncio
+import hashlib
+import json
 import secrets
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 
+from cookbook.core.cache import get_token_cache, get_user_cache
 from cookbook.core.database import get_db
+from cookbook.core.exceptions import InvalidTokenError
+from cookbook.core.jwt_backend import get_jwt_backend
 from cookbook.repositories.user_repository import UserRepository
-from settings import settings
+from cookbook.schemas.user import UserRead
+from settings import get_settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+_password_executor: Executor | None = None
+
+
+# bcrypt импортируется при первом хешировании, а не при старте приложения
 def hash_password(password: str) -> str:
-    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    import bcrypt
+
+    salt = bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
+    hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
 
 def verify_password(password: str, hashed: str) -> bool:
+    import bcrypt
+
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
-def create_access_token(user_id: int, expires_minutes: Optional[int] = None) -> str:
+def get_password_executor() -> Executor:
+    global _password_executor
+    if _password_executor is None:
+        settings = get_settings()
+        if settings.password_hash_executor == "process":
+            _password_executor = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers
+            )
+        else:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                thread_name_prefix="password-hash",
+            )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
+# bcrypt занимает процессор на сотни миллисекунд, поэтому хеширование
+# выполняется в отдельном пуле и не блокирует event loop
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_password_executor(), verify_password, password, hashed
+    )
+
+
+def create_access_token(
+    user_id: int,
+    expires_minutes: Optional[int] = None,
+    claims: Optional[dict] = None,
+) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
-        minutes=expires_minutes or settings.jwt_expire_minutes
+        minutes=expires_minutes or get_settings().jwt_expire_minutes
     )
     payload = {
+        **(claims or {}),
         "sub": str(user_id),
         "exp": expire,
     }
-    token = jwt.encode(payload, settings.jwt_secret, algorithm="HS256")
+    token = get_jwt_backend().encode(
+        payload, get_settings().jwt_secret, algorithm="HS256"
+    )
     return token
 
 
+async def decode_access_token(token: str) -> dict:
+    # Проверенный токен не проверяем повторно до его exp
+    key = f"jwt:{token}"
+    cached = await get_token_cache().get(key)
+    if cached is not None:
+        return json.loads(cached)
+
+    payload = get_jwt_backend().decode(
+        token, get_settings().jwt_secret, algorithms=["HS256"]
+    )
+    ttl = payload.get("exp", 0) - time.time()
+    if ttl > 0:
+        await get_token_cache().set(key, json.dumps(payload).encode(), ttl=ttl)
+    return payload
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db=Depends(get_db),
 ):
     try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret,
-            algorithms=["HS256"],
-        )
+        payload = await decode_access_token(token)
         user_id = int(payload.get("sub"))
-    except (JWTError, KeyError, ValueError):
+    except (InvalidTokenError, KeyError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
 
-    user = await UserRepository.get_by_id(db, user_id)
-    if not user:
+    # Подписанные данные пользователя из токена, без обращения к базе
+    if get_settings().jwt_trust_claims and "email" in payload and "name" in payload:
+        return UserRead(id=user_id, email=payload["email"], name=payload["name"])
+
+    current_user = await get_user_read(db, user_id)
+    if current_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
+    return current_user
+
+
+async def get_user_read(db, user_id: int) -> UserRead | None:
+    cached = await get_user_cache().get(_user_key(user_id))
+    if cached is not None:
+        return UserRead.model_validate_json(cached)
+
+    user = await UserRepository.get_by_id(db, user_id)
+    if not user:
+        return None
 
-    return user
+    user_read = UserRead.model_validate(user, from_attributes=True)
+    await get_user_cache().set(_user_key(user_id), user_read.model_dump_json().encode())
+    return user_read
+
+
+def _user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def invalidate_user(user_id: int) -> None:
+    await get_user_cache().delete(_user_key(user_id))
 
 
 def create_refresh_token() -> str:
     return secrets.token_urlsafe(64)
 
 
+def hash_refresh_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
 def get_refresh_token_expiration(refresh_expire_days: int = 7) -> datetime:
     return datetime.utcnow() + timedelta(days=refresh_expire_days)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """Запрос-лидер отменён: ожидающие повторяют вызов сами."""
+
+
+class SingleFlight:
+    """Объединяет одновременные одинаковые вызовы в один.
+
+    Первый вызов по ключу (лидер) выполняет функцию, остальные ждут его
+    результат или исключение. После завершения ключ удаляется, так что
+    результат не кэшируется и не устаревает.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while (future := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                # shield: отмена одного ожидающего не отменяет общий вызов
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except BaseException as exc:
+            # Лидер работает в своей сессии БД, которую закроет его отмена,
+            # поэтому запрос не продолжаем, а передаём роль ожидающим
+            cancelled = isinstance(exc, asyncio.CancelledError)
+            future.set_exception(_LeaderCancelled() if cancelled else exc)
+            # Помечаем исключение полученным, даже если ожидающих нет
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
+
+
+recipe_flight = SingleFlight()
+ingredient_flight = SingleFlight()
@@ -0,0 +1,92 @@
+import logging
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Ключ scope, по которому MetricsMiddleware не учитывает прогревочные запросы
+WARMUP_SCOPE_KEY = "cookbook.warmup"
+
+
+class StartupReport:
+    """Длительность этапов запуска приложения."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.total_seconds: float | None = None
+        self.process_cpu_seconds: float | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(time.perf_counter() - started, 4)
+
+    def finish(self) -> None:
+        self.total_seconds = round(time.perf_counter() - self.started, 4)
+        # Процессорное время с запуска процесса до готовности, в основном импорты
+        self.process_cpu_seconds = round(time.process_time(), 4)
+        logger.info(
+            "Приложение запущено за %.3f с, этапы: %s",
+            self.total_seconds,
+            ", ".join(f"{name}={seconds:.3f}" for name, seconds in self.phases.items()),
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": self.phases,
+            "total_seconds": self.total_seconds,
+            "process_cpu_seconds": self.process_cpu_seconds,
+        }
+
+
+async def _get(app, url: str) -> int:
+    parts = urlsplit(url)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": parts.path,
+        "raw_path": parts.path.encode(),
+        "query_string": parts.query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"warmup")],
+        "client": None,
+        "server": None,
+        WARMUP_SCOPE_KEY: True,
+    }
+    status_code = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def warm_routes(app, urls: list[str]) -> dict[str, int]:
+    """Прогоняет GET-запросы через всё приложение до приёма трафика.
+
+    Первый запрос строит стек middleware, а каждый маршрут - зависимости,
+    валидаторы и сериализаторы ответа. Ошибки не прерывают запуск.
+    """
+    statuses = {}
+    for url in urls:
+        try:
+            statuses[url] = await _get(app, url)
+        except Exception:
+            statuses[url] = 500
+        if statuses[url] >= 500:
+            logger.warning("Прогрев %s завершился ошибкой %d", url, statuses[url])
+    return statuses
@@ -0,0 +1,95 @@
+class _Node:
+    __slots__ = ("children", "ingredient_id")
+
+    def __init__(self):
+        self.children: dict[str, _Node] = {}
+        self.ingredient_id: int | None = None
+
+
+class PrefixTrie:
+    """Префиксное дерево названий ингредиентов для подсказок без обращения к базе.
+
+    Пока дерево не заполнено через rebuild(), add() и discard() ничего не делают:
+    иначе в нём оказалась бы только часть ингредиентов. version - версия
+    коллекции, из которой дерево построено: по ней видно, что ингредиенты
+    изменил другой процесс.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self.ready = False
+        self.size = 0
+        self.version: int | None = None
+
+    def rebuild(self, items, version: int | None = None) -> None:
+        root = _Node()
+        size = 0
+        for name, ingredient_id in items:
+            node = root
+            for char in name:
+                node = node.children.setdefault(char, _Node())
+            if node.ingredient_id is None:
+                size += 1
+            node.ingredient_id = ingredient_id
+        # Подмена целиком: подсказки во время перестройки видят старое дерево
+        self._root = root
+        self.size = size
+        self.version = version
+        self.ready = True
+
+    def clear(self) -> None:
+        self._root = _Node()
+        self.size = 0
+        self.version = None
+        self.ready = False
+
+    def add(self, name: str, ingredient_id: int) -> None:
+        if not self.ready:
+            return
+        node = self._root
+        for char in name:
+            node = node.children.setdefault(char, _Node())
+        if node.ingredient_id is None:
+            self.size += 1
+        node.ingredient_id = ingredient_id
+
+    def discard(self, name: str) -> None:
+        if not self.ready:
+            return
+        path = [self._root]
+        for char in name:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1].ingredient_id is None:
+            return
+
+        path[-1].ingredient_id = None
+        self.size -= 1
+        # Удаляем опустевшие ветки
+        for depth in range(len(name), 0, -1):
+            node = path[depth]
+            if node.children or node.ingredient_id is not None:
+                break
+            del path[depth - 1].children[name[depth - 1]]
+
+    def suggest(self, prefix: str, limit: int) -> list[tuple[str, int]]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        result: list[tuple[str, int]] = []
+        stack = [(prefix, node)]
+        while stack and len(result) < limit:
+            name, node = stack.pop()
+            if node.ingredient_id is not None:
+                result.append((name, node.ingredient_id))
+            for char in sorted(node.children, reverse=True):
+                stack.append((name + char, node.children[char]))
+        return result
+
+
+ingredient_trie = PrefixTrie()
@@ -1,13 +1,123 @@
-import uvicorn
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+
 from fastapi import FastAPI
+from sqlalchemy.exc import DBAPIError
+
+from cookbook.core.database import (
+    dispose_engines,
+    get_engines,
+    get_sessionmaker,
+    warm_pool,
+)
+from cookbook.core.metrics import MetricsMiddleware
+from cookbook.core.responses import RESPONSE_CLASSES
+from cookbook.core.security import shutdown_password_executor
+from cookbook.core.startup import StartupReport, warm_routes
+from cookbook.routers import (
+    auth_router,
+    health_router,
+    ingredient_router,
+    metrics_router,
+    recipe_router,
+)
+from cookbook.services.ingredient_service import warm_ingredient_trie
+from cookbook.services.user_service import run_refresh_token_sweeper
+from settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    report = StartupReport()
+    app.state.startup_report = report
+
+    # Схема строится заранее, а не на первом запросе к /openapi.json
+    if settings.openapi_warmup:
+        with report.phase("openapi"):
+            app.openapi()
+
+    if settings.db_warmup_connections > 0:
+        with report.phase("db_pool"):
+            for engine in get_engines().values():
+                try:
+                    await warm_pool(engine, settings.db_warmup_connections)
+                except (OSError, DBAPIError):
+                    # База ещё недоступна: соединения откроются по запросу
+                    logger.warning("Не удалось заранее открыть соединения с базой")
+
+    if settings.ingredient_trie_enabled:
+        with report.phase("ingredient_trie"):
+            async with get_sessionmaker()() as db:
+                await warm_ingredient_trie(db)
+
+    # После дерева ингредиентов: подсказки прогреваются уже по нему
+    if settings.route_warmup_urls:
+        with report.phase("routes"):
+            await warm_routes(app, settings.route_warmup_urls)
 
-from cookbook.routers import auth_router, ingredient_router, recipe_router
+    sweeper = None
+    if settings.refresh_token_sweep_interval_seconds > 0:
+        sweeper = asyncio.create_task(
+            run_refresh_token_sweeper(
+                get_sessionmaker(),
+                settings.refresh_token_sweep_interval_seconds,
+                settings.refresh_token_sweep_batch_size,
+            )
+        )
 
-app = FastAPI(title="Cookbook API", version="1.0.0")
+    report.finish()
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
+    shutdown_password_executor()
+    # uvicorn вызывает это после того, как дождался текущих запросов
+    await dispose_engines()
+
+
+def create_app() -> FastAPI:
+    # Настройки читаются здесь, а не при импорте модуля
+    settings = get_settings()
+    app = FastAPI(
+        title="Cookbook API",
+        version="1.0.0",
+        lifespan=lifespan,
+        default_response_class=RESPONSE_CLASSES[settings.default_response_class],
+    )
+
+    app.include_router(auth_router.router)
+    app.include_router(ingredient_router.router)
+    app.include_router(recipe_router.router)
+    app.include_router(health_router.router)
+
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(metrics_router.router)
+    return app
+
+
+@lru_cache
+def get_app() -> FastAPI:
+    return create_app()
+
+
+def __getattr__(name: str):
+    # cookbook.main:app для uvicorn и тестов: приложение создаётся
+    # при первом обращении к атрибуту
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-app.include_router(auth_router.router)
-app.include_router(ingredient_router.router)
-app.include_router(recipe_router.router)
 
 if __name__ == "__main__":
-    uvicorn.run("cookbook.main:app", host="0.0.0.0", port=8000, reload=True)
+    import uvicorn
+
+    uvicorn.run(
+        "cookbook.main:create_app", factory=True, host="0.0.0.0", port=8000, reload=True
+    )
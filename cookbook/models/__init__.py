@@ -1,8 +1,17 @@
 from cookbook.models.base import Base
+from cookbook.models.collection_version import CollectionVersion
 from cookbook.models.ingredient import Ingredient
 from cookbook.models.recipe import Recipe
 from cookbook.models.recipe_ingredients import RecipeIngredient
 from cookbook.models.refresh_token import RefreshToken
 from cookbook.models.user import User
 
-__all__ = ["Base", "Recipe", "Ingredient", "RecipeIngredient", "User", "RefreshToken"]
+__all__ = [
+    "Base",
+    "Recipe",
+    "Ingredient",
+    "RecipeIngredient",
+    "User",
+    "RefreshToken",
+    "CollectionVersion",
+]
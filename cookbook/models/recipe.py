@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import DDL, ForeignKey, Integer, String, Text, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from cookbook.models.base import Base
@@ -11,6 +11,9 @@ class Recipe(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(Text(), nullable=False)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
 
     ingredients: Mapped[list["Ingredient"]] = relationship(
         secondary="recipe_ingredients",
@@ -19,3 +22,36 @@ class Recipe(Base):
 
     owner_id = mapped_column(ForeignKey("users.id"), nullable=False)
     owner = relationship("User")
+
+
+# Полнотекстовый поиск. В Postgres колонка search_vector и GIN-индекс
+# создаются миграцией; для SQLite (тесты) рядом создаётся FTS5-таблица,
+# которую синхронизируют триггеры.
+_SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE recipes_fts USING fts5("
+    "title, description, content='recipes', content_rowid='id')",
+    "CREATE TRIGGER recipes_fts_ai AFTER INSERT ON recipes BEGIN "
+    "INSERT INTO recipes_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER recipes_fts_ad AFTER DELETE ON recipes BEGIN "
+    "INSERT INTO recipes_fts(recipes_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER recipes_fts_au AFTER UPDATE ON recipes BEGIN "
+    "INSERT INTO recipes_fts(recipes_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO recipes_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+]
+
+for _statement in _SQLITE_FTS_DDL:
+    event.listen(
+        Recipe.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+
+event.listen(
+    Recipe.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS recipes_fts").execute_if(dialect="sqlite"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from cookbook.models.base import Base
@@ -11,3 +11,11 @@ class RecipeIngredient(Base):
     ingredient_id: Mapped[int] = mapped_column(
         ForeignKey("ingredients.id"), primary_key=True
     )
+
+    __table_args__ = (
+        Index(
+            "ix_recipe_ingredients_ingredient_id_recipe_id",
+            "ingredient_id",
+            "recipe_id",
+        ),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, LargeBinary, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from cookbook.models.base import Base
@@ -8,10 +8,28 @@ from cookbook.models.base import Base
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        Index(
+            "ix_refresh_tokens_user_id_revoked_expires_at",
+            "user_id",
+            "revoked",
+            "expires_at",
+        ),
+        # Индексы под очистку: просроченные по expires_at, отозванные по
+        # частичному индексу, который содержит только их
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+        Index(
+            "ix_refresh_tokens_revoked",
+            "id",
+            postgresql_where=text("revoked"),
+            sqlite_where=text("revoked"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    token: Mapped[str] = mapped_column(
-        String(128),
+    # sha256 от значения токена: сам токен в базе не хранится
+    token_hash: Mapped[bytes] = mapped_column(
+        LargeBinary(32),
         unique=True,
         index=True,
         nullable=False,
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cookbook.core.database import dialect_insert
+from cookbook.models import CollectionVersion
+
+RECIPES = "recipes"
+INGREDIENTS = "ingredients"
+
+
+class CollectionVersionRepository:
+    @staticmethod
+    async def get(db: AsyncSession, name: str) -> CollectionVersion | None:
+        stmt = select(CollectionVersion).where(CollectionVersion.name == name)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def bump(db: AsyncSession, *names: str) -> None:
+        """Увеличивает версии коллекций.
+
+        Строка версии общая для всех записей коллекции, поэтому вызывать
+        после коммита самих данных, отдельной короткой транзакцией.
+        """
+        now = datetime.now(timezone.utc)
+        for name in names:
+            stmt = dialect_insert(db, CollectionVersion).values(
+                name=name, version=1, updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CollectionVersion.name],
+                set_={"version": CollectionVersion.version + 1, "updated_at": now},
+            )
+            await db.execute(stmt)
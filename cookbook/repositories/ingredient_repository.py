@@ -1,6 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cookbook.core.database import dialect_insert
 from cookbook.models import Ingredient
 
 
@@ -23,6 +24,56 @@ class IngredientRepository:
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    @staticmethod
+    async def suggest(db: AsyncSession, prefix: str, limit: int):
+        stmt = (
+            select(Ingredient)
+            .where(Ingredient.name.startswith(prefix, autoescape=True))
+            .order_by(Ingredient.name)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_or_create_many(
+        db: AsyncSession, names: list[str]
+    ) -> tuple[dict[str, Ingredient], list[str]]:
+        """Возвращает ингредиенты по именам и имена, вставленные этим вызовом."""
+        unique_names = list(dict.fromkeys(names))
+        if not unique_names:
+            return {}, []
+
+        stmt = select(Ingredient).where(Ingredient.name.in_(unique_names))
+        result = await db.execute(stmt)
+        found = {ingredient.name: ingredient for ingredient in result.scalars()}
+
+        created = []
+        missing = [name for name in unique_names if name not in found]
+        if missing:
+            stmt = (
+                dialect_insert(db, Ingredient)
+                .values([{"name": name} for name in missing])
+                .on_conflict_do_nothing(index_elements=[Ingredient.name])
+                .returning(Ingredient)
+            )
+            result = await db.execute(stmt)
+            inserted = {ingredient.name: ingredient for ingredient in result.scalars()}
+            found.update(inserted)
+            created = list(inserted)
+
+            # Ингредиенты, которые параллельно создал другой запрос
+            lost = [name for name in missing if name not in found]
+            if lost:
+                stmt = select(Ingredient).where(Ingredient.name.in_(lost))
+                result = await db.execute(stmt)
+                found.update(
+                    {ingredient.name: ingredient for ingredient in result.scalars()}
+                )
+
+        ingredients = {name: found[name] for name in unique_names if name in found}
+        return ingredients, created
+
     @staticmethod
     async def create(db: AsyncSession, ingredient: Ingredient):
         db.add(ingredient)
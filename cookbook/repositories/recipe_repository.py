@@ -1,18 +1,127 @@
-from sqlalchemy import select
+from operator import itemgetter
+from typing import AsyncIterator, NamedTuple, Sequence
+
+from sqlalchemy import (
+    JSON,
+    Row,
+    Select,
+    func,
+    insert,
+    literal_column,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from cookbook.models import Recipe
+from cookbook.models import Ingredient, Recipe, RecipeIngredient
+
+_SQLITE_SEARCH = text(
+    "SELECT rowid AS id FROM recipes_fts WHERE recipes_fts MATCH :query "
+    "ORDER BY bm25(recipes_fts, 10.0, 1.0), rowid LIMIT :limit OFFSET :offset"
+)
+
+_POSTGRES_SEARCH = text(
+    "SELECT id FROM recipes, to_tsquery('simple', :query) AS query "
+    "WHERE search_vector @@ query "
+    "ORDER BY ts_rank(search_vector, query) DESC, id LIMIT :limit OFFSET :offset"
+)
+
+
+class RecipeRow(NamedTuple):
+    """Рецепт для чтения без ORM. Поля в порядке RecipeRead."""
+
+    title: str
+    description: str
+    id: int
+    version: int
+    ingredients: list[dict]
+
+
+def _read_stmt(db: AsyncSession) -> Select:
+    # Один запрос: ингредиенты собираются в JSON-массив прямо в базе
+    if db.bind.dialect.name == "postgresql":
+        build_object, aggregate = func.json_build_object, func.json_agg
+    else:
+        build_object, aggregate = func.json_object, func.json_group_array
+    # Ключи литералами: тип параметра в json_build_object Postgres не выведет
+    item = build_object(
+        literal_column("'name'"), Ingredient.name, literal_column("'id'"), Ingredient.id
+    )
+    ingredients = aggregate(item, type_=JSON).filter(Ingredient.id.is_not(None))
+    return (
+        select(
+            Recipe.title,
+            Recipe.description,
+            Recipe.id,
+            Recipe.version,
+            ingredients.label("ingredients"),
+        )
+        .outerjoin(RecipeIngredient, RecipeIngredient.recipe_id == Recipe.id)
+        .outerjoin(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+        .group_by(Recipe.id)
+    )
+
+
+def _to_recipe_row(row: Row) -> RecipeRow:
+    # Порядок внутри агрегата не гарантирован, сортируем по id как selectinload
+    ingredients = sorted(row.ingredients or (), key=itemgetter("id"))
+    return RecipeRow(row.title, row.description, row.id, row.version, ingredients)
 
 
 class RecipeRepository:
     @staticmethod
-    async def get_all(db: AsyncSession):
+    async def get_rows(
+        db: AsyncSession, limit: int | None = None, after_id: int | None = None
+    ) -> list[RecipeRow]:
+        stmt = _read_stmt(db).order_by(Recipe.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(Recipe.id > after_id)
+        result = await db.execute(stmt)
+        return [_to_recipe_row(row) for row in result]
+
+    @staticmethod
+    async def get_row_by_id(db: AsyncSession, recipe_id: int) -> RecipeRow | None:
+        result = await db.execute(_read_stmt(db).where(Recipe.id == recipe_id))
+        row = result.one_or_none()
+        return _to_recipe_row(row) if row is not None else None
+
+    @staticmethod
+    async def get_rows_by_ids(
+        db: AsyncSession, recipe_ids: Sequence[int]
+    ) -> list[RecipeRow]:
+        result = await db.execute(_read_stmt(db).where(Recipe.id.in_(recipe_ids)))
+        return [_to_recipe_row(row) for row in result]
+
+    @staticmethod
+    async def stream_rows(
+        db: AsyncSession, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
         stmt = (
-            select(Recipe).options(selectinload(Recipe.ingredients)).order_by(Recipe.id)
+            select(Recipe.id, Recipe.title, Recipe.description, Recipe.version)
+            .order_by(Recipe.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    @staticmethod
+    async def get_ingredients_for(
+        db: AsyncSession, recipe_ids: Sequence[int]
+    ) -> dict[int, list[Row]]:
+        stmt = (
+            select(RecipeIngredient.recipe_id, Ingredient.id, Ingredient.name)
+            .join(Ingredient, Ingredient.id == RecipeIngredient.ingredient_id)
+            .where(RecipeIngredient.recipe_id.in_(recipe_ids))
+            .order_by(RecipeIngredient.recipe_id, Ingredient.id)
         )
         result = await db.execute(stmt)
-        return result.scalars().unique().all()
+        ingredients = {recipe_id: [] for recipe_id in recipe_ids}
+        for row in result:
+            ingredients[row.recipe_id].append(row)
+        return ingredients
 
     @staticmethod
     async def get_by_id(db: AsyncSession, recipe_id: int):
@@ -24,12 +133,93 @@ class RecipeRepository:
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def search_by_ingredients(
+        db: AsyncSession,
+        names: Sequence[str],
+        match_all: bool,
+        limit: int,
+        offset: int = 0,
+    ) -> Sequence[Row]:
+        # Поиск идёт по индексу (ingredient_id, recipe_id) таблицы связей
+        ingredient_ids = select(Ingredient.id).where(Ingredient.name.in_(names))
+        matched = func.count(RecipeIngredient.ingredient_id).label("matched")
+        stmt = (
+            select(RecipeIngredient.recipe_id, matched)
+            .where(RecipeIngredient.ingredient_id.in_(ingredient_ids))
+            .group_by(RecipeIngredient.recipe_id)
+        )
+        if match_all:
+            stmt = stmt.having(matched == len(names)).order_by(
+                RecipeIngredient.recipe_id
+            )
+        else:
+            stmt = stmt.order_by(matched.desc(), RecipeIngredient.recipe_id)
+
+        result = await db.execute(stmt.limit(limit).offset(offset))
+        return result.all()
+
+    @staticmethod
+    async def search_text(
+        db: AsyncSession, terms: Sequence[str], limit: int, offset: int = 0
+    ) -> list[int]:
+        # Каждое слово ищется как префикс, слова объединяются через И
+        if db.bind.dialect.name == "sqlite":
+            stmt = _SQLITE_SEARCH
+            query = " ".join(f'"{term}"*' for term in terms)
+        else:
+            stmt = _POSTGRES_SEARCH
+            query = " & ".join(f"{term}:*" for term in terms)
+
+        result = await db.execute(
+            stmt, {"query": query, "limit": limit, "offset": offset}
+        )
+        return list(result.scalars())
+
+    @staticmethod
+    async def get_ids_by_ingredient(db: AsyncSession, ingredient_id: int):
+        stmt = select(RecipeIngredient.recipe_id).where(
+            RecipeIngredient.ingredient_id == ingredient_id
+        )
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_version(db: AsyncSession, recipe_id: int) -> int | None:
+        stmt = select(Recipe.version).where(Recipe.id == recipe_id)
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    @staticmethod
+    async def bump_versions(db: AsyncSession, recipe_ids: Sequence[int]) -> None:
+        if recipe_ids:
+            stmt = (
+                update(Recipe)
+                .where(Recipe.id.in_(recipe_ids))
+                .values(version=Recipe.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            await db.execute(stmt)
+
     @staticmethod
     async def create(db: AsyncSession, recipe: Recipe):
         db.add(recipe)
         await db.flush()
         return recipe
 
+    @staticmethod
+    async def bulk_create(db: AsyncSession, recipes: list[dict]) -> list[int]:
+        stmt = insert(Recipe.__table__).returning(
+            Recipe.__table__.c.id, sort_by_parameter_order=True
+        )
+        result = await db.execute(stmt, recipes)
+        return list(result.scalars())
+
+    @staticmethod
+    async def bulk_add_ingredients(db: AsyncSession, links: list[dict]) -> None:
+        if links:
+            await db.execute(insert(RecipeIngredient.__table__), links)
+
     @staticmethod
     async def delete(db: AsyncSession, recipe: Recipe):
         await db.delete(recipe)
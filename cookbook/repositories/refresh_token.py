@@ -1,10 +1,13 @@
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import Select, delete, func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cookbook.models.refresh_token import RefreshToken
 
+# Ключ advisory-блокировки Postgres: очищает только один процесс за раз
+SWEEP_LOCK_ID = 0x636F6F6B
+
 
 class RefreshTokenRepository:
     @staticmethod
@@ -17,14 +20,67 @@ class RefreshTokenRepository:
         return refresh_token
 
     @staticmethod
-    async def get_by_token(
+    async def get_by_token_hash(
         db: AsyncSession,
-        token: str,
+        token_hash: bytes,
     ) -> RefreshToken | None:
-        stmt = select(RefreshToken).where(RefreshToken.token == token)
+        stmt = select(RefreshToken).where(RefreshToken.token_hash == token_hash)
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def rotate(
+        db: AsyncSession,
+        token_hash: bytes,
+        new_token_hash: bytes,
+        expires_at: datetime,
+        now: datetime,
+    ) -> int | None:
+        """Отзывает действующий токен и создаёт новый, возвращает user_id.
+
+        Отзыв идёт одним UPDATE с проверкой revoked и expires_at, поэтому
+        из двух одновременных запросов с одним токеном пройдёт только один.
+        """
+        revoked = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == token_hash,
+                RefreshToken.revoked.is_(False),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked=True)
+            .returning(RefreshToken.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        table = RefreshToken.__table__
+
+        if db.bind.dialect.name == "postgresql":
+            # WITH revoked AS (UPDATE ... RETURNING) INSERT ... SELECT: один запрос
+            revoked = revoked.cte("revoked")
+            stmt = (
+                insert(table)
+                .from_select(
+                    ["token_hash", "user_id", "expires_at"],
+                    select(
+                        literal(new_token_hash), revoked.c.user_id, literal(expires_at)
+                    ),
+                )
+                .add_cte(revoked)
+                .returning(table.c.user_id)
+            )
+            result = await db.execute(stmt)
+            return result.scalar_one_or_none()
+
+        result = await db.execute(revoked)
+        user_id = result.scalar_one_or_none()
+        if user_id is not None:
+            await db.execute(
+                insert(table).values(
+                    token_hash=new_token_hash, user_id=user_id, expires_at=expires_at
+                )
+            )
+        return user_id
+
     @staticmethod
     async def revoke(
         db: AsyncSession,
@@ -36,3 +92,38 @@ class RefreshTokenRepository:
     @staticmethod
     async def is_expired(refresh_token: RefreshToken) -> bool:
         return refresh_token.expires_at < datetime.utcnow()
+
+    @staticmethod
+    async def try_lock_sweep(db: AsyncSession) -> bool:
+        """Берёт блокировку очистки до конца транзакции, не дожидаясь её."""
+        if db.bind.dialect.name != "postgresql":
+            return True
+        stmt = select(func.pg_try_advisory_xact_lock(SWEEP_LOCK_ID))
+        result = await db.execute(stmt)
+        return result.scalar_one()
+
+    @staticmethod
+    async def delete_stale(
+        db: AsyncSession,
+        now: datetime,
+        limit: int,
+    ) -> int:
+        # Два запроса вместо одного с OR: каждый идёт по своему индексу
+        deleted = await _delete_ids(
+            db, select(RefreshToken.id).where(RefreshToken.revoked).limit(limit)
+        )
+        if deleted < limit:
+            deleted += await _delete_ids(
+                db,
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at < now)
+                .limit(limit - deleted),
+            )
+        return deleted
+
+
+async def _delete_ids(db: AsyncSession, ids: Select) -> int:
+    # Удаляем пачкой по id, чтобы не держать блокировку на всю таблицу
+    stmt = delete(RefreshToken).where(RefreshToken.id.in_(ids.scalar_subquery()))
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    return result.rowcount
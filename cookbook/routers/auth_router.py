@@ -8,6 +8,7 @@ from cookbook.core.exceptions import AlreadyExistsError, AuthenticationError
 from cookbook.core.security import (
     create_access_token,
     create_refresh_token,
+    get_current_user,
     get_refresh_token_expiration,
 )
 from cookbook.models.refresh_token import RefreshToken
@@ -72,6 +73,11 @@ async def login(
     }
 
 
+@router.get("/me", response_model=UserRead)
+async def me(current_user: UserRead = Depends(get_current_user)):
+    return current_user
+
+
 @router.post("/refresh")
 async def refresh(
     refresh_token: str = Body(..., embed=True),
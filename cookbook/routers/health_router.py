@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Request
+
+from cookbook.core.cache import get_recipe_cache
+from cookbook.core.database import get_pool_stats
+from cookbook.schemas.health import CacheStats, PoolStats, StartupReport
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get(
+    "/db",
+    summary="Состояние пула соединений",
+    response_model=PoolStats,
+)
+async def db_pool_stats():
+    return get_pool_stats()
+
+
+@router.get(
+    "/cache",
+    summary="Статистика кэша рецептов",
+    response_model=CacheStats,
+)
+async def recipe_cache_stats():
+    return get_recipe_cache().stats()
+
+
+@router.get(
+    "/startup",
+    summary="Длительность этапов запуска",
+    response_model=StartupReport,
+)
+async def startup_report(request: Request):
+    return request.app.state.startup_report.as_dict()
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cookbook.core.database import get_db
+from cookbook.core.database import get_db, get_read_db
+from cookbook.core.etag import cache_headers, etag_matches, make_etag, not_modified
 from cookbook.core.exceptions import AlreadyExistsError, NotFoundError
 from cookbook.schemas.ingredient import (
     IngredientCreate,
@@ -12,8 +13,12 @@ from cookbook.services.ingredient_service import (
     create_ingredient_service,
     delete_ingredient_service,
     get_all_ingredients,
+    get_ingredients_version,
+    suggest_ingredients,
 )
 
+MAX_SUGGESTIONS = 50
+
 router = APIRouter(prefix="/ingredients", tags=["Ingredients"])
 
 
@@ -22,8 +27,31 @@ router = APIRouter(prefix="/ingredients", tags=["Ingredients"])
     summary="Список ингредиентов",
     response_model=list[IngredientRead],
 )
-async def list_ingredients(db: AsyncSession = Depends(get_db)):
-    return await get_all_ingredients(db)
+async def list_ingredients(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
+    version, updated_at = await get_ingredients_version(db)
+    headers = cache_headers(make_etag("ingredients", version), updated_at)
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+
+    response.headers.update(headers)
+    return await get_all_ingredients(db, version)
+
+
+@router.get(
+    "/suggest",
+    summary="Подсказки ингредиентов по началу названия",
+    response_model=list[IngredientRead],
+)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await suggest_ingredients(db, q, limit)
 
 
 @router.post(
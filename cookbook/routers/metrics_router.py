@@ -0,0 +1,104 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from cookbook.core.cache import get_recipe_cache, get_token_cache, get_user_cache
+from cookbook.core.database import get_engines, get_pool_stats
+from cookbook.core.metrics import metrics, render_metric
+from cookbook.core.singleflight import ingredient_flight, recipe_flight
+
+router = APIRouter(tags=["Health"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+CACHES = {
+    "recipes": get_recipe_cache,
+    "users": get_user_cache,
+    "tokens": get_token_cache,
+}
+FLIGHTS = {"recipes": recipe_flight, "ingredients": ingredient_flight}
+
+
+def _pool_metrics() -> list[str]:
+    stats = {name: get_pool_stats(engine) for name, engine in get_engines().items()}
+
+    return [
+        render_metric(
+            f"cookbook_db_pool_{field}",
+            "gauge",
+            f"Пул соединений: {field}",
+            [
+                f'cookbook_db_pool_{field}{{engine="{name}"}} {values[field]}'
+                for name, values in stats.items()
+            ],
+        )
+        for field in ("size", "checked_in", "checked_out", "overflow", "waiters")
+    ]
+
+
+def _cache_metrics() -> list[str]:
+    stats = {name: get_cache().stats() for name, get_cache in CACHES.items()}
+    kinds = {
+        "hits": "counter",
+        "misses": "counter",
+        "evictions": "counter",
+        "entries": "gauge",
+        "bytes": "gauge",
+    }
+    result = []
+    for field, kind in kinds.items():
+        name = f"cookbook_cache_{field}" + ("_total" if kind == "counter" else "")
+        result.append(
+            render_metric(
+                name,
+                kind,
+                f"Кэш: {field}",
+                [
+                    f'{name}{{cache="{cache}"}} {values[field]}'
+                    for cache, values in stats.items()
+                ],
+            )
+        )
+    return result
+
+
+def _single_flight_metrics() -> list[str]:
+    stats = {name: flight.stats() for name, flight in FLIGHTS.items()}
+    kinds = {
+        "leaders": ("counter", "запросы, выполненные в БД"),
+        "coalesced": ("counter", "запросы, дождавшиеся чужого результата"),
+        "in_flight": ("gauge", "ключи с запросом в процессе"),
+    }
+    result = []
+    for field, (kind, help_text) in kinds.items():
+        name = f"cookbook_single_flight_{field}" + (
+            "_total" if kind == "counter" else ""
+        )
+        result.append(
+            render_metric(
+                name,
+                kind,
+                f"Single-flight: {help_text}",
+                [
+                    f'{name}{{flight="{flight}"}} {values[field]}'
+                    for flight, values in stats.items()
+                ],
+            )
+        )
+    return result
+
+
+@router.get(
+    "/metrics",
+    summary="Метрики в формате Prometheus",
+    response_class=PlainTextResponse,
+)
+async def prometheus_metrics():
+    body = "\n".join(
+        [
+            metrics.render(),
+            *_pool_metrics(),
+            *_cache_metrics(),
+            *_single_flight_metrics(),
+        ]
+    )
+    return PlainTextResponse(body + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,18 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cookbook.core.database import get_db
-from cookbook.core.exceptions import NotFoundError
+from cookbook.core.database import get_db, get_read_db
+from cookbook.core.etag import cache_headers, etag_matches, make_etag, not_modified
+from cookbook.core.exceptions import InvalidCursorError, NotFoundError
+from cookbook.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor
 from cookbook.core.security import get_current_user
-from cookbook.schemas.recipe import RecipeCreate, RecipeRead, RecipeUpdate
+from cookbook.schemas.recipe import (
+    RecipeCreate,
+    RecipeImportReport,
+    RecipePage,
+    RecipeRead,
+    RecipeSearchResult,
+    RecipeUpdate,
+)
 from cookbook.services.recipe_service import (
     create_recipe_service,
     delete_recipe_service,
-    get_all_recipes,
+    export_recipes,
     get_recipe_by_id,
+    get_recipe_version,
+    get_recipes_page,
+    get_recipes_page_json,
+    get_recipes_version,
+    import_recipes_service,
+    search_recipes,
+    search_recipes_by_ingredients,
     update_recipe_service,
 )
+from settings import get_settings
+
+MAX_IMPORT_CHUNK_SIZE = 10_000
+MAX_SEARCH_INGREDIENTS = 50
 
 router = APIRouter(prefix="/recipes", tags=["Recipes"])
 
@@ -20,10 +51,92 @@ router = APIRouter(prefix="/recipes", tags=["Recipes"])
 @router.get(
     "",
     summary="Список рецептов",
+    response_model=RecipePage,
+)
+async def list_recipes(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(None, description="Курсор следующей страницы"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    # Курсор проверяется до ETag: на некорректный курсор - 400, а не 304
+    if after is not None:
+        try:
+            decode_cursor(after)
+        except InvalidCursorError as e:
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    version, updated_at = await get_recipes_version(db)
+    headers = cache_headers(
+        make_etag("recipes", version, limit, after or ""), updated_at
+    )
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+
+    try:
+        if get_settings().fast_serialization:
+            # Готовые байты: FastAPI не валидирует ответ повторно
+            body = await get_recipes_page_json(db, limit, after, version)
+            return Response(body, media_type="application/json", headers=headers)
+        page = await get_recipes_page(db, limit, after, version)
+    except InvalidCursorError as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response.headers.update(headers)
+    return page
+
+
+@router.get(
+    "/search",
+    summary="Полнотекстовый поиск по названию и описанию",
     response_model=list[RecipeRead],
 )
-async def list_recipes(db: AsyncSession = Depends(get_db)):
-    return await get_all_recipes(db)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await search_recipes(db, q, limit, offset)
+
+
+@router.get(
+    "/by-ingredients",
+    summary="Поиск рецептов по набору ингредиентов",
+    response_model=list[RecipeSearchResult],
+)
+async def search_by_ingredients(
+    names: list[str] = Query(
+        ..., min_length=1, max_length=MAX_SEARCH_INGREDIENTS, alias="name"
+    ),
+    mode: Literal["all", "any"] = Query(
+        "all",
+        description="all — рецепты со всеми ингредиентами, "
+        "any — по убыванию числа совпавших ингредиентов",
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await search_recipes_by_ingredients(
+        db, names, match_all=mode == "all", limit=limit, offset=offset
+    )
+
+
+@router.get(
+    "/export",
+    summary="Выгрузка всех рецептов потоком (NDJSON или JSON-массив)",
+    response_class=StreamingResponse,
+)
+async def export_all_recipes(
+    format: Literal["ndjson", "json"] = Query("ndjson"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(
+        export_recipes(db, format, get_settings().export_chunk_size),
+        media_type=media_type,
+    )
 
 
 @router.get(
@@ -31,9 +144,24 @@ async def list_recipes(db: AsyncSession = Depends(get_db)):
     summary="Получить рецепт по ID",
     response_model=RecipeRead,
 )
-async def get_recipe(recipe_id: int, db: AsyncSession = Depends(get_db)):
+async def get_recipe(
+    recipe_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
     try:
-        return await get_recipe_by_id(recipe_id, db)
+        # Версия нужна и для ETag, и для ключа кэша рецепта
+        version = await get_recipe_version(recipe_id, db)
+        headers = cache_headers(make_etag("recipe", recipe_id, version))
+        if etag_matches(request, headers["ETag"]):
+            return not_modified(headers)
+
+        recipe = await get_recipe_by_id(recipe_id, db, version)
+        response.headers.update(
+            cache_headers(make_etag("recipe", recipe.id, recipe.version))
+        )
+        return recipe
     except NotFoundError as e:
         raise HTTPException(status.HTTP_404_NOT_FOUND, detail=str(e))
     except SQLAlchemyError:
@@ -61,6 +189,32 @@ async def create_recipe(
         )
 
 
+@router.post(
+    "/import",
+    summary="Массовый импорт рецептов из NDJSON",
+    response_model=RecipeImportReport,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def import_recipes(
+    request: Request,
+    chunk_size: int | None = Query(
+        None,
+        ge=1,
+        le=MAX_IMPORT_CHUNK_SIZE,
+        description="По умолчанию import_chunk_size из настроек",
+    ),
+    current_user=Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    chunk_size = chunk_size or get_settings().import_chunk_size
+    return await import_recipes_service(request.stream(), db, current_user, chunk_size)
+
+
 @router.put(
     "/{recipe_id}",
     summary="Обновить рецепт",
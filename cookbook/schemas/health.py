@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    waiters: int
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class StartupReport(BaseModel):
+    phases: dict[str, float]
+    total_seconds: float | None
+    process_cpu_seconds: float
@@ -19,9 +19,32 @@ class RecipeCreate(RecipeBase):
 
 class RecipeRead(RecipeBase):
     id: int
+    version: int = 1
     ingredients: list[IngredientRead] = Field(default_factory=list)
 
 
+class RecipeSearchResult(RecipeRead):
+    matched: int
+
+
+class RecipePage(BaseModel):
+    items: list[RecipeRead]
+    next_cursor: str | None = None
+
+
+class RecipeImportError(BaseModel):
+    line: int
+    error: str
+
+
+class RecipeImportReport(BaseModel):
+    imported: int
+    failed: int
+    errors: list[RecipeImportError]
+    elapsed_seconds: float
+    recipes_per_second: float
+
+
 class RecipeUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
@@ -1,13 +1,81 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cookbook.core.exceptions import AlreadyExistsError, NotFoundError
+from cookbook.core.singleflight import ingredient_flight
+from cookbook.core.trie import ingredient_trie
 from cookbook.models import Ingredient
+from cookbook.repositories.collection_version_repository import (
+    INGREDIENTS,
+    RECIPES,
+    CollectionVersionRepository,
+)
 from cookbook.repositories.ingredient_repository import IngredientRepository
-from cookbook.schemas.ingredient import IngredientCreate
+from cookbook.repositories.recipe_repository import RecipeRepository
+from cookbook.schemas.ingredient import IngredientCreate, IngredientRead
+from cookbook.services.recipe_service import (
+    bump_collection_versions,
+    invalidate_recipe_pages,
+)
+from settings import get_settings
 
 
-async def get_all_ingredients(db: AsyncSession):
-    return await IngredientRepository.get_all(db)
+async def get_ingredients_version(db: AsyncSession):
+    collection = await CollectionVersionRepository.get(db, INGREDIENTS)
+    if collection is None:
+        return 0, None
+    return collection.version, collection.updated_at
+
+
+async def get_all_ingredients(
+    db: AsyncSession, version: int = 0
+) -> list[IngredientRead]:
+    if not get_settings().single_flight_enabled:
+        return await _load_all_ingredients(db)
+    # Ключ с версией: запрос, уже получивший ETag новой версии, не должен
+    # присоединиться к чтению, начатому до записи
+    return await ingredient_flight.do(
+        ("all", version), lambda: _load_all_ingredients(db)
+    )
+
+
+async def _load_all_ingredients(db: AsyncSession) -> list[IngredientRead]:
+    # Схемы, а не ORM-объекты: результат отдаётся запросам с другими сессиями
+    ingredients = await IngredientRepository.get_all(db)
+    return [IngredientRead.model_validate(ingredient) for ingredient in ingredients]
+
+
+async def _rebuild_ingredient_trie(db: AsyncSession, version: int) -> None:
+    ingredients = await IngredientRepository.get_all(db)
+    ingredient_trie.rebuild(
+        ((ingredient.name, ingredient.id) for ingredient in ingredients), version
+    )
+
+
+async def warm_ingredient_trie(db: AsyncSession) -> None:
+    version, _ = await get_ingredients_version(db)
+    await _rebuild_ingredient_trie(db, version)
+
+
+async def _sync_ingredient_trie(db: AsyncSession) -> None:
+    # Ингредиенты меняют другие воркеры, поды, импорт и создание рецептов.
+    # Версия коллекции увеличивается после коммита, поэтому дерево,
+    # прочитанное после неё, уже содержит все изменения этой версии
+    version, _ = await get_ingredients_version(db)
+    if version != ingredient_trie.version:
+        await ingredient_flight.do(
+            ("trie", version), lambda: _rebuild_ingredient_trie(db, version)
+        )
+
+
+async def suggest_ingredients(db: AsyncSession, query: str, limit: int):
+    prefix = query.strip().lower()
+    if get_settings().ingredient_trie_enabled and ingredient_trie.ready:
+        await _sync_ingredient_trie(db)
+        return [
+            IngredientRead(id=ingredient_id, name=name)
+            for name, ingredient_id in ingredient_trie.suggest(prefix, limit)
+        ]
+    return await IngredientRepository.suggest(db, prefix, limit)
 
 
 async def create_ingredient_service(data: IngredientCreate, db: AsyncSession):
@@ -19,23 +87,32 @@ async def create_ingredient_service(data: IngredientCreate, db: AsyncSession):
     try:
         await IngredientRepository.create(db, ingredient)
         await db.commit()
-        await db.refresh(ingredient)
-        return ingredient
     except Exception:
         await db.rollback()
         raise
 
+    ingredient_trie.add(ingredient.name, ingredient.id)
+    await bump_collection_versions(db, INGREDIENTS)
+    await db.refresh(ingredient)
+    return ingredient
+
 
 async def delete_ingredient_service(ingredient_id: int, db: AsyncSession):
     ingredient = await IngredientRepository.get_by_id(db, ingredient_id)
     if ingredient is None:
         raise NotFoundError("Ингредиент не найден")
 
+    recipe_ids = await RecipeRepository.get_ids_by_ingredient(db, ingredient_id)
     try:
         await IngredientRepository.delete(db, ingredient)
+        await RecipeRepository.bump_versions(db, recipe_ids)
         await db.commit()
-        return ingredient
-
     except Exception:
         await db.rollback()
         raise
+
+    if recipe_ids:
+        await invalidate_recipe_pages()
+    ingredient_trie.discard(ingredient.name)
+    await bump_collection_versions(db, INGREDIENTS, *([RECIPES] if recipe_ids else []))
+    return ingredient
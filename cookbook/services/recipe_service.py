@@ -1,21 +1,256 @@
+import json
+import logging
+import re
+import time
+from typing import AsyncIterable, AsyncIterator
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from cookbook.core.cache import get_recipe_cache
 from cookbook.core.exceptions import NotFoundError
+from cookbook.core.pagination import decode_cursor, encode_cursor
+from cookbook.core.singleflight import recipe_flight
+from cookbook.core.trie import ingredient_trie
 from cookbook.models import Ingredient, Recipe, User
+from cookbook.repositories.collection_version_repository import (
+    INGREDIENTS,
+    RECIPES,
+    CollectionVersionRepository,
+)
 from cookbook.repositories.ingredient_repository import IngredientRepository
 from cookbook.repositories.recipe_repository import RecipeRepository
-from cookbook.schemas.recipe import RecipeCreate, RecipeUpdate
+from cookbook.schemas.recipe import (
+    RecipeCreate,
+    RecipeImportError,
+    RecipeImportReport,
+    RecipePage,
+    RecipeRead,
+    RecipeSearchResult,
+    RecipeUpdate,
+)
+from settings import get_settings
 
+logger = logging.getLogger(__name__)
 
-async def get_all_recipes(db: AsyncSession):
-    return await RecipeRepository.get_all(db)
+RECIPE_PAGES_PREFIX = "recipes:page:"
+MAX_REPORTED_IMPORT_ERRORS = 1000
 
 
-async def get_recipe_by_id(recipe_id: int, db: AsyncSession):
-    recipe = await RecipeRepository.get_by_id(db, recipe_id)
+def _recipe_key(recipe_id: int, version: int) -> str:
+    # Версия в ключе, как у страниц: запись в другом воркере или чтение,
+    # начатое до записи, не вернут старое тело под новой версией. Записи
+    # старых версий никто больше не читает, их вытесняют TTL и LRU
+    return f"recipe:{recipe_id}:{version}"
+
+
+async def invalidate_recipe_pages() -> None:
+    await get_recipe_cache().delete_prefix(RECIPE_PAGES_PREFIX)
+
+
+def _remember_ingredients(ingredients: dict[str, Ingredient]) -> None:
+    # Рецепты создают недостающие ингредиенты, подсказки должны их видеть
+    for name, ingredient in ingredients.items():
+        ingredient_trie.add(name, ingredient.id)
+
+
+async def bump_collection_versions(db: AsyncSession, *names: str) -> None:
+    # Версия увеличивается после коммита данных: иначе блокировка общей
+    # строки версии держится всю транзакцию и выстраивает записи в очередь.
+    # В окне между коммитами читатель может получить новые данные со старой
+    # версией, но следующий запрос после увеличения всё равно их обновит.
+    # Данные к этому моменту уже сохранены, поэтому ошибка только логируется:
+    # 500 на успешную запись привёл бы к повтору и дублям
+    if not names:
+        return
+    try:
+        await CollectionVersionRepository.bump(db, *names)
+        await db.commit()
+    except SQLAlchemyError:
+        await db.rollback()
+        logger.exception("Не удалось увеличить версии коллекций %s", names)
+
+
+async def get_recipes_version(db: AsyncSession):
+    collection = await CollectionVersionRepository.get(db, RECIPES)
+    if collection is None:
+        return 0, None
+    return collection.version, collection.updated_at
+
+
+async def get_recipes_page(
+    db: AsyncSession, limit: int, after: str | None = None, version: int = 0
+):
+    after_id = decode_cursor(after) if after is not None else None
+    # Версия коллекции в ключе: запись в другом процессе сменит ключ
+    cache_key = f"{RECIPE_PAGES_PREFIX}{version}:{limit}:{after_id}"
+    cached = await get_recipe_cache().get(cache_key)
+    if cached is not None:
+        return RecipePage.model_validate_json(cached)
+
+    # Берём на одну запись больше, чтобы понять, есть ли следующая страница
+    rows = await RecipeRepository.get_rows(db, limit + 1, after_id)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    page = RecipePage.model_validate(
+        {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
+    )
+    await get_recipe_cache().set(cache_key, page.model_dump_json().encode())
+    return page
+
+
+def _recipe_row_to_dict(row, ingredients) -> dict:
+    # Порядок ключей как у RecipeRead, чтобы ответ не отличался от обычного пути
+    return {
+        "title": row.title,
+        "description": row.description,
+        "id": row.id,
+        "version": row.version,
+        "ingredients": [{"name": ing.name, "id": ing.id} for ing in ingredients],
+    }
+
+
+async def get_recipes_page_json(
+    db: AsyncSession, limit: int, after: str | None = None, version: int = 0
+) -> bytes:
+    """Страница рецептов сразу в виде JSON, без ORM-объектов и Pydantic."""
+    after_id = decode_cursor(after) if after is not None else None
+    cache_key = f"{RECIPE_PAGES_PREFIX}{version}:{limit}:{after_id}"
+    cached = await get_recipe_cache().get(cache_key)
+    if cached is not None:
+        return cached
+
+    rows = await RecipeRepository.get_rows(db, limit + 1, after_id)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+
+    body = orjson.dumps(
+        {"items": [row._asdict() for row in rows], "next_cursor": next_cursor}
+    )
+    await get_recipe_cache().set(cache_key, body)
+    return body
+
+
+async def search_recipes_by_ingredients(
+    db: AsyncSession,
+    names: list[str],
+    match_all: bool,
+    limit: int,
+    offset: int = 0,
+) -> list[RecipeSearchResult]:
+    names = list(dict.fromkeys(name.strip().lower() for name in names))
+    matches = await RecipeRepository.search_by_ingredients(
+        db, names, match_all, limit, offset
+    )
+    if not matches:
+        return []
+
+    recipes = await RecipeRepository.get_rows_by_ids(
+        db, [row.recipe_id for row in matches]
+    )
+    by_id = {recipe.id: recipe for recipe in recipes}
+    return [
+        RecipeSearchResult.model_validate({**recipe._asdict(), "matched": row.matched})
+        for row in matches
+        if (recipe := by_id.get(row.recipe_id)) is not None
+    ]
+
+
+async def search_recipes(
+    db: AsyncSession, query: str, limit: int, offset: int = 0
+) -> list[RecipeRead]:
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return []
+
+    recipe_ids = await RecipeRepository.search_text(db, terms, limit, offset)
+    if not recipe_ids:
+        return []
+
+    recipes = await RecipeRepository.get_rows_by_ids(db, recipe_ids)
+    by_id = {recipe.id: recipe for recipe in recipes}
+    return [
+        RecipeRead.model_validate(by_id[recipe_id]._asdict())
+        for recipe_id in recipe_ids
+        if recipe_id in by_id
+    ]
+
+
+async def export_recipes(
+    db: AsyncSession, fmt: str, chunk_size: int
+) -> AsyncIterator[bytes]:
+    if fmt == "json":
+        yield b"["
+    first = True
+
+    async for rows in RecipeRepository.stream_rows(db, chunk_size):
+        ingredients = await RecipeRepository.get_ingredients_for(
+            db, [row.id for row in rows]
+        )
+        lines = [
+            json.dumps(
+                _recipe_row_to_dict(row, ingredients[row.id]),
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            for row in rows
+        ]
+
+        if fmt == "json":
+            chunk = ",".join(lines)
+            yield (chunk if first else "," + chunk).encode("utf-8")
+        else:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+        first = False
+
+    if fmt == "json":
+        yield b"]"
+
+
+async def get_recipe_version(recipe_id: int, db: AsyncSession) -> int:
+    version = await RecipeRepository.get_version(db, recipe_id)
+    if version is None:
+        raise NotFoundError("Рецепт не найден")
+    return version
+
+
+async def get_recipe_by_id(
+    recipe_id: int, db: AsyncSession, version: int | None = None
+) -> RecipeRead:
+    if version is None:
+        version = await get_recipe_version(recipe_id, db)
+    cached = await get_recipe_cache().get(_recipe_key(recipe_id, version))
+    if cached is not None:
+        return RecipeRead.model_validate_json(cached)
+
+    if not get_settings().single_flight_enabled:
+        return await _load_recipe(recipe_id, db)
+    # Одновременные промахи кэша по одному рецепту ждут один запрос в БД.
+    # Ключ с версией: запрос, уже прочитавший новую версию, не должен
+    # присоединиться к чтению, начатому до записи
+    return await recipe_flight.do(
+        (recipe_id, version), lambda: _load_recipe(recipe_id, db)
+    )
+
+
+async def _load_recipe(recipe_id: int, db: AsyncSession) -> RecipeRead:
+    recipe = await RecipeRepository.get_row_by_id(db, recipe_id)
     if recipe is None:
         raise NotFoundError("Рецепт не найден")
-    return recipe
+
+    data = RecipeRead.model_validate(recipe._asdict())
+    # Ключ по версии из самой строки: если рецепт успели изменить, тело
+    # ляжет под своей, более новой версией
+    await get_recipe_cache().set(
+        _recipe_key(recipe_id, data.version), data.model_dump_json().encode()
+    )
+    return data
 
 
 async def create_recipe_service(
@@ -24,26 +259,23 @@ async def create_recipe_service(
     recipe = Recipe(
         title=data.title, description=data.description, owner_id=current_user.id
     )
-    ing_list = []
     try:
-        for ing_data in data.ingredients:
-            ingredient = await IngredientRepository.get_by_name(db, ing_data.name)
-            if ingredient is None:
-                ingredient = Ingredient(name=ing_data.name)
-                await IngredientRepository.create(db, ingredient)
-
-            ing_list.append(ingredient)
-
-        recipe.ingredients = ing_list
+        ingredients, created = await IngredientRepository.get_or_create_many(
+            db, [ing_data.name for ing_data in data.ingredients]
+        )
+        recipe.ingredients = list(ingredients.values())
         await RecipeRepository.create(db, recipe)
         await db.commit()
-        await db.refresh(recipe, attribute_names=["ingredients"])
-        return recipe
-
     except Exception:
         await db.rollback()
         raise
 
+    await invalidate_recipe_pages()
+    _remember_ingredients(ingredients)
+    await bump_collection_versions(db, RECIPES, *([INGREDIENTS] if created else []))
+    await db.refresh(recipe, attribute_names=["ingredients"])
+    return recipe
+
 
 async def update_recipe_service(
     recipe_id: int, data: RecipeUpdate, db: AsyncSession, current_user: User
@@ -59,33 +291,33 @@ async def update_recipe_service(
         )
 
     try:
+        created = []
         update_data = data.model_dump(exclude_unset=True)
         if "title" in update_data:
             recipe.title = update_data["title"]
         if "description" in update_data:
             recipe.description = update_data["description"]
         if "ingredients" in update_data:
-            new_ingredients = []
-            for ing_data in update_data["ingredients"]:
-                ingredient = await IngredientRepository.get_by_name(
-                    db, ing_data["name"]
-                )
-                if ingredient is None:
-                    ingredient = Ingredient(name=ing_data["name"])
-                    await IngredientRepository.create(db, ingredient)
-                new_ingredients.append(ingredient)
-
-            recipe.ingredients = new_ingredients
+            ingredients, created = await IngredientRepository.get_or_create_many(
+                db, [ing_data["name"] for ing_data in update_data["ingredients"]]
+            )
+            recipe.ingredients = list(ingredients.values())
 
+        # Увеличение в SQL: параллельные PUT получают разные версии, а не
+        # одну и ту же N+1, посчитанную от загруженного значения
+        recipe.version = Recipe.version + 1
         await RecipeRepository.update(db, recipe)
         await db.commit()
-        await db.refresh(recipe, attribute_names=["ingredients"])
-        return recipe
-
     except Exception:
         await db.rollback()
         raise
 
+    await invalidate_recipe_pages()
+    await bump_collection_versions(db, RECIPES, *([INGREDIENTS] if created else []))
+    await db.refresh(recipe, attribute_names=["version", "ingredients"])
+    _remember_ingredients({ing.name: ing for ing in recipe.ingredients})
+    return recipe
+
 
 async def delete_recipe_service(recipe_id: int, db: AsyncSession, current_user: User):
     recipe = await RecipeRepository.get_by_id(db, recipe_id)
@@ -99,8 +331,153 @@ async def delete_recipe_service(recipe_id: int, db: AsyncSession, current_user:
     try:
         await RecipeRepository.delete(db, recipe)
         await db.commit()
-        return recipe
-
     except Exception:
         await db.rollback()
         raise
+
+    await invalidate_recipe_pages()
+    await bump_collection_versions(db, RECIPES)
+    return recipe
+
+
+async def _iter_lines(
+    stream: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes | None]:
+    """Строки тела запроса; None вместо строки длиннее max_line_bytes.
+
+    Остаток слишком длинной строки отбрасывается до следующего перевода
+    строки, так что в памяти не держится больше max_line_bytes.
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                # Хвост длинной строки, о которой уже сообщили
+                skipping = False
+                continue
+            yield line if len(line) <= max_line_bytes else None
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield None
+                skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield buffer
+
+
+async def _import_chunk(
+    db: AsyncSession,
+    chunk: list[tuple[int, RecipeCreate]],
+    owner_id: int,
+    known_ingredients: dict[str, int],
+) -> list[str]:
+    """Сохраняет пачку рецептов и возвращает имена созданных ингредиентов."""
+    created = []
+    new_names = [
+        ing.name
+        for _, data in chunk
+        for ing in data.ingredients
+        if ing.name not in known_ingredients
+    ]
+    if new_names:
+        ingredients, created = await IngredientRepository.get_or_create_many(
+            db, new_names
+        )
+        known_ingredients.update(
+            {name: ingredient.id for name, ingredient in ingredients.items()}
+        )
+
+    recipe_ids = await RecipeRepository.bulk_create(
+        db,
+        [
+            {
+                "title": data.title,
+                "description": data.description,
+                "owner_id": owner_id,
+            }
+            for _, data in chunk
+        ],
+    )
+    links = []
+    for recipe_id, (_, data) in zip(recipe_ids, chunk):
+        ingredient_ids = dict.fromkeys(
+            known_ingredients[ing.name] for ing in data.ingredients
+        )
+        links.extend(
+            {"recipe_id": recipe_id, "ingredient_id": ingredient_id}
+            for ingredient_id in ingredient_ids
+        )
+    await RecipeRepository.bulk_add_ingredients(db, links)
+    await db.commit()
+    return created
+
+
+async def import_recipes_service(
+    stream: AsyncIterable[bytes],
+    db: AsyncSession,
+    current_user: User,
+    chunk_size: int,
+) -> RecipeImportReport:
+    started = time.perf_counter()
+    imported = 0
+    failed = 0
+    errors: list[RecipeImportError] = []
+    known_ingredients: dict[str, int] = {}
+
+    def add_error(line_no: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_IMPORT_ERRORS:
+            errors.append(RecipeImportError(line=line_no, error=error))
+
+    async def flush(chunk: list[tuple[int, RecipeCreate]]) -> None:
+        nonlocal imported
+        try:
+            created = await _import_chunk(db, chunk, current_user.id, known_ingredients)
+        except SQLAlchemyError as e:
+            await db.rollback()
+            # Ингредиенты из откатанной транзакции больше не существуют
+            known_ingredients.clear()
+            for line_no, _ in chunk:
+                add_error(line_no, f"Ошибка базы данных: {e.__class__.__name__}")
+            return
+        imported += len(chunk)
+        await invalidate_recipe_pages()
+        for name in created:
+            ingredient_trie.add(name, known_ingredients[name])
+        await bump_collection_versions(db, RECIPES, *([INGREDIENTS] if created else []))
+
+    chunk: list[tuple[int, RecipeCreate]] = []
+    line_no = 0
+    max_line_bytes = get_settings().import_max_line_bytes
+    async for line in _iter_lines(stream, max_line_bytes):
+        line_no += 1
+        if line is None:
+            add_error(line_no, f"Строка длиннее {max_line_bytes} байт")
+            continue
+        if not line.strip():
+            continue
+        try:
+            chunk.append((line_no, RecipeCreate.model_validate_json(line)))
+        except ValidationError as e:
+            add_error(line_no, str(e.errors(include_url=False)))
+            continue
+
+        if len(chunk) >= chunk_size:
+            await flush(chunk)
+            chunk = []
+
+    if chunk:
+        await flush(chunk)
+
+    elapsed = time.perf_counter() - started
+    return RecipeImportReport(
+        imported=imported,
+        failed=failed,
+        errors=errors,
+        elapsed_seconds=round(elapsed, 3),
+        recipes_per_second=round(imported / elapsed, 1) if elapsed else 0.0,
+    )
@@ -1,19 +1,26 @@
+import asyncio
+import logging
 from datetime import datetime
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from cookbook.core.exceptions import AlreadyExistsError, AuthenticationError
 from cookbook.core.security import (
     create_access_token,
     create_refresh_token,
     get_refresh_token_expiration,
-    hash_password,
-    verify_password,
+    get_user_read,
+    hash_password_async,
+    hash_refresh_token,
+    verify_password_async,
 )
 from cookbook.models import User
 from cookbook.models.refresh_token import RefreshToken
 from cookbook.repositories.refresh_token import RefreshTokenRepository
 from cookbook.repositories.user_repository import UserRepository
+from cookbook.schemas.user import UserRead
+
+logger = logging.getLogger(__name__)
 
 
 async def register_user_service(
@@ -25,7 +32,7 @@ async def register_user_service(
     user = User(
         email=email,
         name=name,
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
     )
 
     try:
@@ -38,18 +45,23 @@ async def register_user_service(
         raise
 
 
+def _create_user_access_token(user: User | UserRead) -> str:
+    # С jwt_trust_claims эти поля позволяют не читать пользователя из базы
+    return create_access_token(user.id, claims={"email": user.email, "name": user.name})
+
+
 async def login_user_service(
     db: AsyncSession, email: str, password: str
 ) -> tuple[str, str]:
     user = await UserRepository.get_by_email(db, email)
-    if not user or not verify_password(password, user.password_hash):
+    if not user or not await verify_password_async(password, user.password_hash):
         raise AuthenticationError("Неправильный email или пароль")
 
-    access_token = create_access_token(user.id)
+    access_token = _create_user_access_token(user)
 
     refresh_token_value = create_refresh_token()
     refresh_token = RefreshToken(
-        token=refresh_token_value,
+        token_hash=hash_refresh_token(refresh_token_value),
         user_id=user.id,
         expires_at=get_refresh_token_expiration(),
     )
@@ -63,48 +75,74 @@ async def refresh_tokens_service(
     db: AsyncSession,
     refresh_token_value: str,
 ) -> tuple[str, str]:
-    token = await RefreshTokenRepository.get_by_token(
+    token_hash = hash_refresh_token(refresh_token_value)
+    new_refresh_value = create_refresh_token()
+
+    user_id = await RefreshTokenRepository.rotate(
         db,
-        refresh_token_value,
+        token_hash,
+        hash_refresh_token(new_refresh_value),
+        get_refresh_token_expiration(),
+        datetime.utcnow(),
     )
 
-    if not token or token.revoked:
-        raise AuthenticationError("Invalid refresh token")
-
-    if token.expires_at < datetime.utcnow():
+    if user_id is None:
+        # Дополнительный запрос только на неуспешном пути, ради текста ошибки
+        token = await RefreshTokenRepository.get_by_token_hash(db, token_hash)
+        if not token or token.revoked:
+            raise AuthenticationError("Invalid refresh token")
         await RefreshTokenRepository.revoke(db, token)
         await db.commit()
         raise AuthenticationError("Refresh token expired")
 
-    user_id = token.user_id
-
-    await RefreshTokenRepository.revoke(db, token)
-
-    new_refresh_value = create_refresh_token()
-    new_refresh = RefreshToken(
-        token=new_refresh_value,
-        user_id=user_id,
-        expires_at=get_refresh_token_expiration(),
-    )
-
-    await RefreshTokenRepository.create(db, new_refresh)
-
-    access_token = create_access_token(user_id)
-
     await db.commit()
 
-    return access_token, new_refresh_value
+    user = await get_user_read(db, user_id)
+    if user is None:
+        raise AuthenticationError("Invalid refresh token")
+    return _create_user_access_token(user), new_refresh_value
 
 
 async def logout_service(
     db: AsyncSession,
     refresh_token_value: str,
 ) -> None:
-    token = await RefreshTokenRepository.get_by_token(
+    token = await RefreshTokenRepository.get_by_token_hash(
         db,
-        refresh_token_value,
+        hash_refresh_token(refresh_token_value),
     )
 
     if token and not token.revoked:
         await RefreshTokenRepository.revoke(db, token)
         await db.commit()
+
+
+async def sweep_refresh_tokens(db: AsyncSession, batch_size: int) -> int:
+    """Удаляет отозванные и просроченные refresh-токены пачками."""
+    now = datetime.utcnow()
+    total = 0
+    while True:
+        # Каждая пачка в своей транзакции: блокировки короткие. Очистку
+        # запускает каждый воркер, но пачку удаляет только один из них
+        if not await RefreshTokenRepository.try_lock_sweep(db):
+            await db.rollback()
+            return total
+        deleted = await RefreshTokenRepository.delete_stale(db, now, batch_size)
+        await db.commit()
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+async def run_refresh_token_sweeper(
+    session_factory: async_sessionmaker, interval: float, batch_size: int
+) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                deleted = await sweep_refresh_tokens(db, batch_size)
+            logger.info("Удалено refresh-токенов: %d", deleted)
+        except Exception:
+            # Сбой одного прохода не должен останавливать задачу
+            logger.exception("Очистка refresh-токенов завершилась ошибкой")
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -12,6 +15,63 @@ class Settings(BaseSettings):
     jwt_secret: str
     jwt_expire_minutes: int
     refresh_expire_days: int
+    jwt_trust_claims: bool = False
+    jwt_backend: Literal["jose", "pyjwt"] = "jose"
+    jwt_cache_max_entries: int = 10_000
+
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_executor: Literal["thread", "process"] = "thread"
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 100
+    db_command_timeout: float | None = None
+
+    replica_database_url: str | None = None
+    replica_lag_tolerance_seconds: float = 5
+    replica_retry_seconds: float = 30
+
+    cache_enabled: bool = True
+    cache_ttl_seconds: float = 60
+    cache_max_entries: int = 10_000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    user_cache_ttl_seconds: float = 30
+    user_cache_max_entries: int = 10_000
+
+    ingredient_trie_enabled: bool = False
+    fast_serialization: bool = True
+    single_flight_enabled: bool = True
+    default_response_class: Literal["json", "orjson"] = "orjson"
+    openapi_warmup: bool = True
+    # GET-запросы, которыми прогреваются маршруты при запуске; [] - выключить
+    route_warmup_urls: list[str] = [
+        "/recipes?limit=1",
+        "/recipes/1",
+        "/ingredients",
+        "/ingredients/suggest?q=a",
+    ]
+    db_warmup_connections: int = 0
+    metrics_enabled: bool = True
+    n_plus_one_threshold: int = 10
+    refresh_token_sweep_interval_seconds: float = 0
+    refresh_token_sweep_batch_size: int = 1000
+
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int | None = None
+    server_loop: Literal["auto", "uvloop", "asyncio"] = "uvloop"
+    server_http: Literal["auto", "httptools", "h11"] = "httptools"
+    server_backlog: int = 2048
+    server_keep_alive_seconds: int = 5
+    server_graceful_shutdown_seconds: int = 30
+
+    export_chunk_size: int = 1000
+    import_chunk_size: int = 1000
+    import_max_line_bytes: int = 1024 * 1024
 
     @property
     def sqlalchemy_url(self) -> str:
@@ -24,4 +84,7 @@ class Settings(BaseSettings):
     model_config = ConfigDict(env_file=".env")
 
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    # Настройки читаются при первом обращении, а не при импорте модуля
+    return Settings()
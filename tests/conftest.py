@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from cookbook.core.cache import get_recipe_cache, get_token_cache, get_user_cache
 from cookbook.core.database import get_db
 from cookbook.core.security import hash_password
 from cookbook.main import app
@@ -19,6 +20,17 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+async def clear_cache():
+    await get_recipe_cache().clear()
+    await get_user_cache().clear()
+    await get_token_cache().clear()
+    yield
+    await get_recipe_cache().clear()
+    await get_user_cache().clear()
+    await get_token_cache().clear()
+
+
 @pytest.fixture(scope="function")
 async def db():
     engine = create_async_engine(
@@ -46,6 +58,7 @@ def client(db):
         yield db
 
     app.dependency_overrides[database.get_db] = override_get_db
+    app.dependency_overrides[database.get_read_db] = override_get_db
 
     with TestClient(app) as c:
         yield c
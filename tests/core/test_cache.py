@@ -0,0 +1,64 @@
+from cookbook.core.cache import InMemoryCache
+
+
+def make_cache(**kwargs) -> InMemoryCache:
+    options = {"ttl": 60, "max_entries": 10, "max_bytes": 1024}
+    options.update(kwargs)
+    return InMemoryCache(**options)
+
+
+async def test_get_set():
+    cache = make_cache()
+    await cache.set("a", b"1")
+
+    assert await cache.get("a") == b"1"
+    assert await cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+async def test_ttl_expiration():
+    cache = make_cache()
+    await cache.set("a", b"1", ttl=0)
+
+    assert await cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+async def test_lru_eviction_by_entries():
+    cache = make_cache(max_entries=2)
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+    await cache.get("a")
+    await cache.set("c", b"3")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"1"
+    assert await cache.get("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+
+async def test_eviction_by_bytes():
+    cache = make_cache(max_bytes=10)
+    await cache.set("a", b"12345")
+    await cache.set("b", b"123456")
+
+    assert await cache.get("a") is None
+    assert await cache.get("b") == b"123456"
+    assert cache.stats()["bytes"] == 6
+
+    await cache.set("c", b"x" * 11)
+    assert await cache.get("c") is None
+
+
+async def test_delete_prefix():
+    cache = make_cache()
+    await cache.set("recipes:page:1", b"1")
+    await cache.set("recipes:page:2", b"2")
+    await cache.set("recipe:1", b"3")
+
+    await cache.delete_prefix("recipes:page:")
+
+    assert await cache.get("recipes:page:1") is None
+    assert await cache.get("recipes:page:2") is None
+    assert await cache.get("recipe:1") == b"3"
@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from cookbook.core import database
+from cookbook.models import Base, Ingredient
+
+
+def make_sessionmaker(engine, **kwargs):
+    return async_sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False, **kwargs
+    )
+
+
+@pytest.fixture
+async def engines(tmp_path, monkeypatch):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'cookbook.db'}"
+    primary_engine = database.create_engine_from_settings(url)
+    replica_engine = database.create_engine_from_settings(url)
+    async with primary_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    primary = make_sessionmaker(
+        primary_engine, sync_session_class=database.PrimarySession
+    )
+    replica = make_sessionmaker(replica_engine)
+    monkeypatch.setattr(database, "get_sessionmaker", lambda: primary)
+    monkeypatch.setattr(database, "get_read_sessionmaker", lambda: replica)
+    monkeypatch.setattr(database, "_last_write_at", float("-inf"))
+    monkeypatch.setattr(database, "_replica_unavailable_until", float("-inf"))
+
+    yield primary_engine, replica_engine
+
+    await primary_engine.dispose()
+    await replica_engine.dispose()
+
+
+async def open_read_session():
+    gen = database.get_read_db()
+    db = await anext(gen)
+    return gen, db
+
+
+async def test_read_db_uses_replica(engines):
+    _, replica_engine = engines
+
+    gen, db = await open_read_session()
+    assert db.bind is replica_engine
+    await gen.aclose()
+
+
+async def test_read_db_falls_back_to_primary_after_write(engines):
+    primary_engine, _ = engines
+
+    async with database.get_sessionmaker()() as session:
+        session.add(Ingredient(name="salt"))
+        await session.commit()
+
+    gen, db = await open_read_session()
+    assert db.bind is primary_engine
+    await gen.aclose()
+
+
+async def test_read_db_falls_back_to_primary_when_replica_down(
+    engines, tmp_path, monkeypatch
+):
+    primary_engine, _ = engines
+    broken_engine = database.create_engine_from_settings(
+        f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    )
+    broken = make_sessionmaker(broken_engine)
+    monkeypatch.setattr(database, "get_read_sessionmaker", lambda: broken)
+
+    gen, db = await open_read_session()
+    assert db.bind is primary_engine
+    await gen.aclose()
+    await broken_engine.dispose()
+
+
+async def test_warm_pool_opens_connections(engines):
+    primary_engine, _ = engines
+
+    await database.warm_pool(primary_engine, 3)
+
+    assert database.get_pool_stats(primary_engine)["checked_in"] == 3
+
+
+async def test_engines_recreated_after_fork():
+    engine = database.get_engine()
+    sessionmaker = database.get_sessionmaker()
+
+    database._reset_engines_after_fork()
+
+    assert database.get_engine() is not engine
+    assert database.get_sessionmaker() is not sessionmaker
+    assert database.get_sessionmaker().kw["bind"] is database.get_engine()
+
+
+async def test_dispose_engines_does_not_create_engine():
+    database._reset_engines_after_fork()
+
+    await database.dispose_engines()
+
+    assert database.get_engine.cache_info().currsize == 0
@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cookbook.core.metrics import (
+    Histogram,
+    RequestStats,
+    _request_stats,
+    instrument_engine,
+    metrics,
+)
+from cookbook.models import User
+from settings import get_settings
+
+
+def test_histogram_samples_are_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0.5, 2, 3, 10):
+        histogram.observe(value)
+
+    assert histogram.samples("latency", 'route="/"') == [
+        'latency_bucket{route="/",le="1"} 1',
+        'latency_bucket{route="/",le="5"} 3',
+        'latency_bucket{route="/",le="+Inf"} 4',
+        'latency_sum{route="/"} 15.5',
+        'latency_count{route="/"} 4',
+    ]
+
+
+async def test_queries_counted_per_request(db: AsyncSession):
+    instrument_engine(db.bind)
+    stats = RequestStats("GET", "/test")
+    token = _request_stats.set(stats)
+    try:
+        await db.execute(select(User))
+        await db.execute(select(User).where(User.id == 1))
+    finally:
+        _request_stats.reset(token)
+
+    assert stats.queries == 2
+    assert stats.db_time > 0
+
+
+async def test_failed_query_does_not_leak_start_time(db: AsyncSession):
+    instrument_engine(db.bind)
+    stats = RequestStats("GET", "/test")
+    token = _request_stats.set(stats)
+    try:
+        with pytest.raises(OperationalError):
+            await db.execute(text("SELECT * FROM missing_table"))
+        await db.execute(select(User))
+        connection = await db.connection()
+    finally:
+        _request_stats.reset(token)
+
+    assert stats.queries == 1
+    assert "query_started" not in connection.info
+
+
+async def test_n_plus_one_detected(db: AsyncSession, caplog, monkeypatch):
+    monkeypatch.setattr(get_settings(), "n_plus_one_threshold", 3)
+    instrument_engine(db.bind)
+    detected = metrics.n_plus_one_total
+    token = _request_stats.set(RequestStats("GET", "/test"))
+    try:
+        with caplog.at_level(logging.WARNING, logger="cookbook.core.metrics"):
+            for user_id in range(6):
+                await db.execute(select(User).where(User.id == user_id))
+    finally:
+        _request_stats.reset(token)
+
+    assert metrics.n_plus_one_total == detected + 1
+    assert [record.message for record in caplog.records if "N+1" in record.message]
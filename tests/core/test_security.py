@@ -0,0 +1,99 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cookbook.core.cache import get_token_cache
+from cookbook.core.exceptions import InvalidTokenError
+from cookbook.core.jwt_backend import JoseBackend
+from cookbook.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_access_token,
+    get_current_user,
+    hash_refresh_token,
+    invalidate_user,
+)
+from settings import get_settings
+
+
+async def test_get_current_user(db: AsyncSession, test_user):
+    token = create_access_token(test_user.id)
+
+    user = await get_current_user(token, db)
+
+    assert user.id == test_user.id
+    assert user.email == test_user.email
+
+
+async def test_get_current_user_cached(db: AsyncSession, test_user):
+    token = create_access_token(test_user.id)
+    await get_current_user(token, db)
+
+    await db.delete(test_user)
+    await db.commit()
+
+    user = await get_current_user(token, db)
+    assert user.id == test_user.id
+
+    await invalidate_user(test_user.id)
+    with pytest.raises(HTTPException):
+        await get_current_user(token, db)
+
+
+async def test_get_current_user_trusted_claims(db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(get_settings(), "jwt_trust_claims", True)
+    token = create_access_token(
+        42, claims={"email": "claims@example.com", "name": "claims"}
+    )
+
+    user = await get_current_user(token, db)
+
+    assert user.id == 42
+    assert user.email == "claims@example.com"
+
+
+async def test_get_current_user_invalid_token(db: AsyncSession):
+    with pytest.raises(HTTPException):
+        await get_current_user("broken", db)
+
+
+async def test_decode_access_token_cached():
+    token = create_access_token(7)
+
+    payload = await decode_access_token(token)
+
+    assert payload["sub"] == "7"
+    assert await get_token_cache().get(f"jwt:{token}") is not None
+    assert await decode_access_token(token) == payload
+
+
+async def test_decode_access_token_expired_not_cached():
+    token = create_access_token(7, expires_minutes=-1)
+
+    with pytest.raises(InvalidTokenError):
+        await decode_access_token(token)
+    assert get_token_cache().stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("backend_name", ["jose", "pyjwt"])
+def test_jwt_backends_roundtrip(backend_name):
+    if backend_name == "pyjwt":
+        pytest.importorskip("jwt")
+        from cookbook.core.jwt_backend import PyJWTBackend as backend_class
+    else:
+        backend_class = JoseBackend
+    backend = backend_class()
+
+    token = backend.encode({"sub": "1"}, "secret", algorithm="HS256")
+
+    assert backend.decode(token, "secret", algorithms=["HS256"]) == {"sub": "1"}
+    with pytest.raises(InvalidTokenError):
+        backend.decode(token, "other", algorithms=["HS256"])
+
+
+def test_hash_refresh_token():
+    token = create_refresh_token()
+
+    assert len(hash_refresh_token(token)) == 32
+    assert hash_refresh_token(token) == hash_refresh_token(token)
+    assert hash_refresh_token(token) != hash_refresh_token(create_refresh_token())
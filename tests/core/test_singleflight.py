@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from cookbook.core.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_result():
+    flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do(1, load) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+    # Завершённый вызов не кэшируется
+    assert await flight.do(1, load) == 2
+
+
+async def test_exception_shared_with_waiters():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.leaders == 1
+    assert flight.in_flight == 0
+
+
+async def test_cancelled_leader_hands_over_to_waiter():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("key", slow))
+    await started.wait()
+    waiter = asyncio.create_task(flight.do("key", fast))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == "ok"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flight.leaders == 2
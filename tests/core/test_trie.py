@@ -0,0 +1,37 @@
+from cookbook.core.trie import PrefixTrie
+
+
+def make_trie() -> PrefixTrie:
+    trie = PrefixTrie()
+    trie.rebuild([("salt", 1), ("sugar", 2), ("sugar syrup", 3), ("milk", 4)])
+    return trie
+
+
+def test_suggest_prefix():
+    trie = make_trie()
+
+    assert trie.suggest("s", 10) == [("salt", 1), ("sugar", 2), ("sugar syrup", 3)]
+    assert trie.suggest("sug", 1) == [("sugar", 2)]
+    assert trie.suggest("x", 10) == []
+    assert trie.size == 4
+
+
+def test_add_and_discard():
+    trie = make_trie()
+    trie.add("sage", 5)
+    trie.discard("sugar")
+    trie.discard("unknown")
+
+    assert trie.suggest("s", 10) == [("sage", 5), ("salt", 1), ("sugar syrup", 3)]
+    assert trie.size == 4
+
+    trie.discard("sugar syrup")
+    assert trie.suggest("su", 10) == []
+
+
+def test_not_ready_ignores_changes():
+    trie = PrefixTrie()
+    trie.add("salt", 1)
+
+    assert not trie.ready
+    assert trie.suggest("s", 10) == []
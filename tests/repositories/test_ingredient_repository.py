@@ -51,3 +51,24 @@ async def test_delete_ingredient(db: AsyncSession):
 
     fetched = await IngredientRepository.get_by_id(db, created.id)
     assert fetched is None
+
+
+async def test_get_or_create_many(db: AsyncSession):
+    salt = await create_test_ingredient(db, "salt")
+
+    ingredients, created = await IngredientRepository.get_or_create_many(
+        db, ["salt", "pepper", "salt", "sugar"]
+    )
+    await db.commit()
+
+    assert list(ingredients) == ["salt", "pepper", "sugar"]
+    assert created == ["pepper", "sugar"]
+    assert ingredients["salt"].id == salt.id
+    assert ingredients["pepper"].id is not None
+
+    all_ingredients = await IngredientRepository.get_all(db)
+    assert sorted(ing.name for ing in all_ingredients) == ["pepper", "salt", "sugar"]
+
+
+async def test_get_or_create_many_empty(db: AsyncSession):
+    assert await IngredientRepository.get_or_create_many(db, []) == ({}, [])
@@ -42,6 +42,31 @@ async def test_get_recipe_by_id(db: AsyncSession, test_user):
     assert fetched.owner_id == test_user.id
 
 
+async def test_get_row_by_id(db: AsyncSession, test_user):
+    recipe = await create_test_recipe(db, test_user)
+    row = await RecipeRepository.get_row_by_id(db, recipe.id)
+
+    assert row.title == recipe.title
+    assert row.ingredients == [
+        {"name": ing.name, "id": ing.id} for ing in recipe.ingredients
+    ]
+    assert await RecipeRepository.get_row_by_id(db, recipe.id + 1) is None
+
+
+async def test_get_rows_without_ingredients(db: AsyncSession, test_user):
+    recipe = await create_test_recipe(db, test_user)
+    empty = Recipe(title="Water", description="Just water", owner_id=test_user.id)
+    await RecipeRepository.create(db, empty)
+    await db.commit()
+
+    rows = await RecipeRepository.get_rows(db)
+    assert [row.id for row in rows] == [recipe.id, empty.id]
+    assert rows[1].ingredients == []
+
+    rows = await RecipeRepository.get_rows(db, limit=1, after_id=recipe.id)
+    assert [row.title for row in rows] == ["Water"]
+
+
 async def test_delete_recipe(db: AsyncSession, test_user):
     recipe = await create_test_recipe(db, test_user)
     await RecipeRepository.delete(db, recipe)
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from cookbook.core.security import hash_refresh_token
+from cookbook.models.refresh_token import RefreshToken
+from cookbook.repositories.refresh_token import RefreshTokenRepository
+
+
+async def create_tokens(db: AsyncSession, test_user) -> None:
+    now = datetime.utcnow()
+    for i in range(5):
+        db.add(
+            RefreshToken(
+                token_hash=hash_refresh_token(f"expired-{i}"),
+                user_id=test_user.id,
+                expires_at=now - timedelta(days=1),
+            )
+        )
+        db.add(
+            RefreshToken(
+                token_hash=hash_refresh_token(f"revoked-{i}"),
+                user_id=test_user.id,
+                expires_at=now + timedelta(days=1),
+                revoked=True,
+            )
+        )
+    db.add(
+        RefreshToken(
+            token_hash=hash_refresh_token("active"),
+            user_id=test_user.id,
+            expires_at=now + timedelta(days=1),
+        )
+    )
+    await db.commit()
+
+
+async def test_delete_stale_respects_limit(db: AsyncSession, test_user):
+    await create_tokens(db, test_user)
+
+    deleted = await RefreshTokenRepository.delete_stale(db, datetime.utcnow(), 3)
+    await db.commit()
+
+    assert deleted == 3
+    remaining = (await db.execute(select(RefreshToken))).scalars().all()
+    assert len(remaining) == 8
+
+
+async def test_get_by_token_hash(db: AsyncSession, test_user):
+    await create_tokens(db, test_user)
+
+    token = await RefreshTokenRepository.get_by_token_hash(
+        db, hash_refresh_token("active")
+    )
+    assert token is not None and not token.revoked
+    assert await RefreshTokenRepository.get_by_token_hash(db, b"\0" * 32) is None
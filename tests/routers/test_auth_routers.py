@@ -0,0 +1,14 @@
+from fastapi import status
+
+
+def test_me(client, auth_token: str, test_user):
+    response = client.get("/auth/me", headers={"Authorization": auth_token})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["email"] == test_user.email
+
+
+def test_me_unauthorized(client):
+    response = client.get("/auth/me", headers={"Authorization": "Bearer broken"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,59 @@
+from fastapi import status
+
+from cookbook.core.metrics import instrument_engine, metrics
+from cookbook.core.startup import warm_routes
+from cookbook.main import app
+from settings import get_settings
+
+
+def test_db_pool_stats(client):
+    response = client.get("/health/db")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["size"] == get_settings().db_pool_size
+    assert data["checked_out"] == 0
+    assert data["overflow"] == 0
+    assert data["waiters"] == 0
+
+
+def test_startup_report(client):
+    response = client.get("/health/startup")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert "openapi" in data["phases"]
+    assert "routes" in data["phases"]
+    assert data["total_seconds"] >= data["phases"]["openapi"]
+    assert data["process_cpu_seconds"] > 0
+
+
+def test_metrics(client, db):
+    instrument_engine(db.bind)
+    client.get("/recipes/9")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert (
+        'cookbook_http_request_duration_seconds_count{method="GET",'
+        'route="/recipes/{recipe_id}",status="404"}' in body
+    )
+    assert 'cookbook_db_pool_size{engine="primary"}' in body
+    assert 'cookbook_cache_hits_total{cache="recipes"}' in body
+    assert 'cookbook_single_flight_leaders_total{flight="recipes"}' in body
+    queries = metrics.request_queries[("GET", "/recipes/{recipe_id}")]
+    assert queries.count >= 1 and queries.sum >= 1
+
+
+async def test_warm_routes_skips_metrics(client):
+    before = metrics.request_latency.get(("GET", "/recipes/{recipe_id}", 404))
+    count = before.count if before is not None else 0
+
+    statuses = await warm_routes(app, ["/recipes?limit=1", "/recipes/1"])
+
+    assert statuses == {"/recipes?limit=1": 200, "/recipes/1": 404}
+    after = metrics.request_latency.get(("GET", "/recipes/{recipe_id}", 404))
+    assert (after.count if after is not None else 0) == count
@@ -62,3 +62,27 @@ def test_delete_ingredient_not_found(client):
     response = client.delete(f"/ingredients/{non_existent_id}")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_suggest_ingredients(client):
+    for name in ("salt", "sugar", "milk"):
+        client.post("/ingredients/", json={"name": name})
+
+    response = client.get("/ingredients/suggest", params={"q": "su"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["name"] for item in response.json()] == ["sugar"]
+
+
+def test_list_ingredients_etag(client):
+    client.post("/ingredients/", json={"name": "salt"})
+    response = client.get("/ingredients/")
+    etag = response.headers["ETag"]
+
+    response = client.get("/ingredients/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.post("/ingredients/", json={"name": "sugar"})
+    response = client.get("/ingredients/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()) == 2
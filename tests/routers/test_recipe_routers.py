@@ -1,6 +1,10 @@
+import json
+
 import pytest
 from fastapi import status
 
+from settings import get_settings
+
 
 def test_create_recipe_success(client, auth_token: str):
     client.post("/ingredients/", json={"name": "Salt"})
@@ -124,3 +128,235 @@ def test_delete_recipe_success(client, auth_token: str):
 def test_delete_recipe_not_found(client, auth_token: str):
     response = client.delete("/recipes/9", headers={"Authorization": auth_token})
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_list_recipes_paginated(client, auth_token: str):
+    for title in ("Soup", "Cake", "Tea"):
+        client.post(
+            "/recipes/",
+            json={"title": title, "description": title, "ingredients": []},
+            headers={"Authorization": auth_token},
+        )
+
+    first = client.get("/recipes/", params={"limit": 2})
+    assert first.status_code == status.HTTP_200_OK
+    first_page = first.json()
+    assert [item["title"] for item in first_page["items"]] == ["soup", "cake"]
+    assert first_page["next_cursor"] is not None
+
+    second = client.get(
+        "/recipes/", params={"limit": 2, "after": first_page["next_cursor"]}
+    )
+    second_page = second.json()
+    assert [item["title"] for item in second_page["items"]] == ["tea"]
+    assert second_page["next_cursor"] is None
+
+
+def test_list_recipes_limit_too_large(client):
+    response = client.get("/recipes/", params={"limit": 1000})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_list_recipes_invalid_cursor(client):
+    response = client.get("/recipes/", params={"after": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get(
+        "/recipes/", params={"after": "not-a-cursor"}, headers={"If-None-Match": "*"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def create_recipes_for_export(client, auth_token: str):
+    for title, ingredients in (("Soup", ["water", "salt"]), ("Tea", ["water"])):
+        client.post(
+            "/recipes/",
+            json={
+                "title": title,
+                "description": title,
+                "ingredients": [{"name": name} for name in ingredients],
+            },
+            headers={"Authorization": auth_token},
+        )
+
+
+def test_export_recipes_ndjson(client, auth_token: str):
+    create_recipes_for_export(client, auth_token)
+
+    response = client.get("/recipes/export")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [item["title"] for item in lines] == ["soup", "tea"]
+    assert {ing["name"] for ing in lines[0]["ingredients"]} == {"water", "salt"}
+    assert [ing["name"] for ing in lines[1]["ingredients"]] == ["water"]
+
+
+def test_export_recipes_json(client, auth_token: str, monkeypatch):
+    monkeypatch.setattr(get_settings(), "export_chunk_size", 1)
+    create_recipes_for_export(client, auth_token)
+
+    response = client.get("/recipes/export", params={"format": "json"})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [item["title"] for item in data] == ["soup", "tea"]
+
+
+def test_export_recipes_empty(client):
+    response = client.get("/recipes/export", params={"format": "json"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+
+
+def test_import_recipes(client, auth_token: str):
+    body = "\n".join(
+        json.dumps({"title": title, "description": title, "ingredients": []})
+        for title in ("Soup", "Tea")
+    )
+
+    response = client.post(
+        "/recipes/import",
+        content=body,
+        headers={"Authorization": auth_token, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 0
+
+    titles = [item["title"] for item in client.get("/recipes/").json()["items"]]
+    assert titles == ["soup", "tea"]
+
+
+def test_import_recipes_unauthorized(client):
+    response = client.post("/recipes/import", content=b"")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_search_by_ingredients(client, auth_token: str):
+    recipes = {
+        "Omelette": ["eggs", "milk", "salt"],
+        "Pancakes": ["eggs", "milk", "flour"],
+        "Tea": ["water"],
+    }
+    for title, ingredients in recipes.items():
+        client.post(
+            "/recipes/",
+            json={
+                "title": title,
+                "description": title,
+                "ingredients": [{"name": name} for name in ingredients],
+            },
+            headers={"Authorization": auth_token},
+        )
+
+    response = client.get(
+        "/recipes/by-ingredients", params=[("name", "Eggs"), ("name", "flour")]
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["title"] for item in response.json()] == ["pancakes"]
+
+    response = client.get(
+        "/recipes/by-ingredients",
+        params=[("name", "salt"), ("name", "eggs"), ("mode", "any")],
+    )
+    data = response.json()
+    assert [item["title"] for item in data] == ["omelette", "pancakes"]
+    assert [item["matched"] for item in data] == [2, 1]
+
+
+def test_search_by_ingredients_requires_names(client):
+    response = client.get("/recipes/by-ingredients")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+def test_search_recipes(client, auth_token: str):
+    recipes = {
+        "Pancakes": "Thin pancakes with milk",
+        "Tomato soup": "Soup for dinner",
+        "Salad": "Goes well with tomato soup",
+    }
+    for title, description in recipes.items():
+        client.post(
+            "/recipes/",
+            json={"title": title, "description": description, "ingredients": []},
+            headers={"Authorization": auth_token},
+        )
+
+    response = client.get("/recipes/search", params={"q": "pan"})
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["title"] for item in response.json()] == ["pancakes"]
+
+    response = client.get("/recipes/search", params={"q": "Tomato SOUP"})
+    assert [item["title"] for item in response.json()] == ["tomato soup", "salad"]
+
+    response = client.get("/recipes/search", params={"q": "soup", "limit": 1})
+    assert [item["title"] for item in response.json()] == ["tomato soup"]
+
+
+def test_search_recipes_after_update_and_delete(client, auth_token: str):
+    create_res = client.post(
+        "/recipes/",
+        json={"title": "Porridge", "description": "Oat", "ingredients": []},
+        headers={"Authorization": auth_token},
+    )
+    recipe_id = create_res.json()["id"]
+
+    client.put(
+        f"/recipes/{recipe_id}",
+        json={"title": "Muesli"},
+        headers={"Authorization": auth_token},
+    )
+    assert client.get("/recipes/search", params={"q": "porridge"}).json() == []
+    assert len(client.get("/recipes/search", params={"q": "muesli"}).json()) == 1
+
+    client.delete(f"/recipes/{recipe_id}", headers={"Authorization": auth_token})
+    assert client.get("/recipes/search", params={"q": "muesli"}).json() == []
+
+
+def test_get_recipe_etag(client, auth_token: str):
+    create_res = client.post(
+        "/recipes/",
+        json={"title": "Tea", "description": "Hot tea", "ingredients": []},
+        headers={"Authorization": auth_token},
+    )
+    recipe_id = create_res.json()["id"]
+
+    response = client.get(f"/recipes/{recipe_id}")
+    etag = response.headers["ETag"]
+
+    response = client.get(f"/recipes/{recipe_id}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+
+    client.put(
+        f"/recipes/{recipe_id}",
+        json={"title": "Green tea"},
+        headers={"Authorization": auth_token},
+    )
+    response = client.get(f"/recipes/{recipe_id}", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["title"] == "green tea"
+
+
+def test_list_recipes_etag(client, auth_token: str):
+    response = client.get("/recipes/")
+    etag = response.headers["ETag"]
+
+    response = client.get("/recipes/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    client.post(
+        "/recipes/",
+        json={"title": "Tea", "description": "Hot tea", "ingredients": []},
+        headers={"Authorization": auth_token},
+    )
+    response = client.get("/recipes/", headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert "Last-Modified" in response.headers
+    assert [item["title"] for item in response.json()["items"]] == ["tea"]
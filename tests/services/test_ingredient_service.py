@@ -1,15 +1,26 @@
+import asyncio
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from cookbook.core.exceptions import AlreadyExistsError, NotFoundError
+from cookbook.core.trie import ingredient_trie
 from cookbook.models import Ingredient
+from cookbook.repositories.collection_version_repository import (
+    INGREDIENTS,
+    CollectionVersionRepository,
+)
 from cookbook.repositories.ingredient_repository import IngredientRepository
 from cookbook.schemas.ingredient import IngredientCreate
+from cookbook.services import ingredient_service
 from cookbook.services.ingredient_service import (
     create_ingredient_service,
     delete_ingredient_service,
     get_all_ingredients,
+    suggest_ingredients,
+    warm_ingredient_trie,
 )
+from settings import get_settings
 
 
 async def test_get_all_ingredients(db: AsyncSession):
@@ -57,3 +68,71 @@ async def test_delete_ingredient_success(db: AsyncSession):
 async def test_delete_ingredient_not_found(db: AsyncSession):
     with pytest.raises(NotFoundError):
         await delete_ingredient_service(9, db)
+
+
+async def test_suggest_ingredients_from_db(db: AsyncSession):
+    for name in ("salt", "sugar", "milk", "50_50"):
+        await create_ingredient_service(IngredientCreate(name=name), db)
+
+    suggestions = await suggest_ingredients(db, " S", limit=10)
+    assert [ing.name for ing in suggestions] == ["salt", "sugar"]
+
+    suggestions = await suggest_ingredients(db, "50_", limit=10)
+    assert [ing.name for ing in suggestions] == ["50_50"]
+
+
+async def test_suggest_ingredients_from_trie(db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(get_settings(), "ingredient_trie_enabled", True)
+    await create_ingredient_service(IngredientCreate(name="salt"), db)
+    await warm_ingredient_trie(db)
+    try:
+        sugar = await create_ingredient_service(IngredientCreate(name="sugar"), db)
+        salt = await IngredientRepository.get_by_name(db, "salt")
+        await delete_ingredient_service(salt.id, db)
+
+        suggestions = await suggest_ingredients(db, "s", limit=10)
+        assert [(ing.id, ing.name) for ing in suggestions] == [(sugar.id, "sugar")]
+    finally:
+        ingredient_trie.clear()
+
+
+async def test_suggest_ingredients_trie_resyncs_on_version_change(
+    db: AsyncSession, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "ingredient_trie_enabled", True)
+    await create_ingredient_service(IngredientCreate(name="salt"), db)
+    await warm_ingredient_trie(db)
+    try:
+        # Запись другого процесса: в локальное дерево она не попала
+        ingredient_trie.discard("salt")
+        await IngredientRepository.create(db, Ingredient(name="sage"))
+        await db.commit()
+        await CollectionVersionRepository.bump(db, INGREDIENTS)
+        await db.commit()
+
+        suggestions = await suggest_ingredients(db, "s", limit=10)
+        assert [ing.name for ing in suggestions] == ["sage", "salt"]
+    finally:
+        ingredient_trie.clear()
+
+
+async def test_get_all_ingredients_flight_keyed_by_version(
+    db: AsyncSession, monkeypatch
+):
+    loads = []
+
+    async def load(db):
+        index = len(loads)
+        loads.append(index)
+        await asyncio.sleep(0.01)
+        return index
+
+    monkeypatch.setattr(ingredient_service, "_load_all_ingredients", load)
+
+    results = await asyncio.gather(
+        get_all_ingredients(db, 1),
+        get_all_ingredients(db, 1),
+        get_all_ingredients(db, 2),
+    )
+
+    assert results == [0, 0, 1]
@@ -1,23 +1,41 @@
+import asyncio
+
 import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from cookbook.core.exceptions import NotFoundError
+from cookbook.core.cache import get_recipe_cache
+from cookbook.core.exceptions import InvalidCursorError, NotFoundError
+from cookbook.core.singleflight import recipe_flight
 from cookbook.models import Ingredient, Recipe
+from cookbook.repositories.collection_version_repository import (
+    CollectionVersionRepository,
+)
 from cookbook.repositories.ingredient_repository import IngredientRepository
 from cookbook.repositories.recipe_repository import RecipeRepository
 from cookbook.schemas.ingredient import IngredientCreate
-from cookbook.schemas.recipe import RecipeCreate, RecipeUpdate
-from cookbook.services.ingredient_service import create_ingredient_service
+from cookbook.schemas.recipe import RecipeCreate, RecipePage, RecipeUpdate
+from cookbook.services import recipe_service
+from cookbook.services.ingredient_service import (
+    create_ingredient_service,
+    delete_ingredient_service,
+    get_ingredients_version,
+)
 from cookbook.services.recipe_service import (
     create_recipe_service,
     delete_recipe_service,
-    get_all_recipes,
     get_recipe_by_id,
+    get_recipes_page,
+    get_recipes_page_json,
+    get_recipes_version,
+    import_recipes_service,
     update_recipe_service,
 )
+from settings import get_settings
 
 
-async def test_get_all_recipes(db: AsyncSession, test_user):
+async def test_get_recipes_page_lists_recipes(db: AsyncSession, test_user):
     recipe_data1 = RecipeCreate(
         title="Pancakes",
         description="Delicious pancakes",
@@ -31,7 +49,7 @@ async def test_get_all_recipes(db: AsyncSession, test_user):
     await create_recipe_service(recipe_data1, db, test_user)
     await create_recipe_service(recipe_data2, db, test_user)
 
-    recipes = await get_all_recipes(db)
+    recipes = (await get_recipes_page(db, limit=10)).items
 
     assert len(recipes) == 2
     titles = {recipe.title for recipe in recipes}
@@ -40,6 +58,48 @@ async def test_get_all_recipes(db: AsyncSession, test_user):
     assert descriptions == {"Delicious pancakes", "Simple omelette"}
 
 
+async def test_get_recipes_page(db: AsyncSession, test_user):
+    for title in ("first", "second", "third"):
+        await create_recipe_service(
+            RecipeCreate(title=title, description=title, ingredients=[]),
+            db,
+            test_user,
+        )
+
+    page = await get_recipes_page(db, limit=2)
+    assert [recipe.title for recipe in page.items] == ["first", "second"]
+    assert page.next_cursor is not None
+
+    next_page = await get_recipes_page(db, limit=2, after=page.next_cursor)
+    assert [recipe.title for recipe in next_page.items] == ["third"]
+    assert next_page.next_cursor is None
+
+
+async def test_get_recipes_page_json_matches_model(db: AsyncSession, test_user):
+    for title in ("first", "second", "third"):
+        await create_recipe_service(
+            RecipeCreate(
+                title=title,
+                description=title,
+                ingredients=[IngredientCreate(name="salt")],
+            ),
+            db,
+            test_user,
+        )
+
+    body = await get_recipes_page_json(db, limit=2)
+    await get_recipe_cache().clear()
+    page = await get_recipes_page(db, limit=2)
+
+    assert RecipePage.model_validate_json(body) == page
+    assert body == page.model_dump_json().encode()
+
+
+async def test_get_recipes_page_invalid_cursor(db: AsyncSession):
+    with pytest.raises(InvalidCursorError):
+        await get_recipes_page(db, limit=2, after="broken")
+
+
 async def test_get_recipe_by_id_success(db: AsyncSession, test_user):
     recipe_data = RecipeCreate(
         title="Soup",
@@ -58,6 +118,167 @@ async def test_get_recipe_by_id_success(db: AsyncSession, test_user):
     assert ingredient_names == {"carrot", "potato"}
 
 
+async def test_get_recipe_by_id_coalesces_concurrent_misses(
+    db: AsyncSession, test_user
+):
+    recipe_data = RecipeCreate(
+        title="Porridge",
+        description="Oat porridge",
+        ingredients=[IngredientCreate(name="oats")],
+    )
+    created_recipe = await create_recipe_service(recipe_data, db, test_user)
+    leaders = recipe_flight.leaders
+
+    recipes = await asyncio.gather(
+        *(get_recipe_by_id(created_recipe.id, db, version=1) for _ in range(5))
+    )
+
+    assert {recipe.title for recipe in recipes} == {"porridge"}
+    assert recipe_flight.leaders == leaders + 1
+
+
+async def test_get_recipe_by_id_flight_keyed_by_version(monkeypatch):
+    loads = []
+
+    async def load(recipe_id, db):
+        loads.append(recipe_id)
+        await asyncio.sleep(0.01)
+        return len(loads)
+
+    monkeypatch.setattr(recipe_service, "_load_recipe", load)
+
+    results = await asyncio.gather(
+        get_recipe_by_id(1, None, version=1),
+        get_recipe_by_id(1, None, version=1),
+        get_recipe_by_id(1, None, version=2),
+    )
+
+    assert results[0] == results[1]
+    assert loads == [1, 1]
+
+
+async def test_get_recipe_by_id_cache_invalidated_on_update(
+    db: AsyncSession, test_user
+):
+    recipe_data = RecipeCreate(
+        title="Tea",
+        description="Black tea",
+        ingredients=[IngredientCreate(name="water")],
+    )
+    created_recipe = await create_recipe_service(recipe_data, db, test_user)
+    await get_recipe_by_id(created_recipe.id, db)
+
+    await update_recipe_service(
+        created_recipe.id, RecipeUpdate(title="Green tea"), db, test_user
+    )
+
+    recipe = await get_recipe_by_id(created_recipe.id, db)
+    assert recipe.title == "green tea"
+
+
+async def test_get_recipe_by_id_cache_invalidated_on_ingredient_delete(
+    db: AsyncSession, test_user
+):
+    recipe_data = RecipeCreate(
+        title="Toast",
+        description="Toast with butter",
+        ingredients=[IngredientCreate(name="bread"), IngredientCreate(name="butter")],
+    )
+    created_recipe = await create_recipe_service(recipe_data, db, test_user)
+    await get_recipe_by_id(created_recipe.id, db)
+
+    assert await get_recipe_cache().get(f"recipe:{created_recipe.id}:1") is not None
+
+    butter = await IngredientRepository.get_by_name(db, "butter")
+    await delete_ingredient_service(butter.id, db)
+
+    recipe = await get_recipe_by_id(created_recipe.id, db)
+    assert recipe.version == 2
+    assert [ing.name for ing in recipe.ingredients] == ["bread"]
+
+
+async def test_get_recipe_by_id_sees_outside_update(db: AsyncSession, test_user):
+    recipe_data = RecipeCreate(
+        title="Cocoa",
+        description="Hot cocoa",
+        ingredients=[IngredientCreate(name="milk")],
+    )
+    created_recipe = await create_recipe_service(recipe_data, db, test_user)
+    await get_recipe_by_id(created_recipe.id, db)
+
+    # Запись другого воркера: кэш этого процесса о ней не знает
+    await RecipeRepository.bump_versions(db, [created_recipe.id])
+    await db.commit()
+
+    recipe = await get_recipe_by_id(created_recipe.id, db)
+    assert recipe.version == 2
+
+
+async def test_create_recipe_survives_version_bump_failure(
+    db: AsyncSession, test_user, monkeypatch
+):
+    async def fail(db, *names):
+        raise OperationalError("UPDATE collection_versions", {}, Exception("locked"))
+
+    monkeypatch.setattr(CollectionVersionRepository, "bump", fail)
+
+    recipe = await create_recipe_service(
+        RecipeCreate(title="Bun", description="Sweet bun", ingredients=[]),
+        db,
+        test_user,
+    )
+
+    assert (await get_recipe_by_id(recipe.id, db)).title == "bun"
+
+
+async def test_update_recipe_increments_version_in_sql(db: AsyncSession, test_user):
+    recipe_data = RecipeCreate(
+        title="Jam",
+        description="Berry jam",
+        ingredients=[IngredientCreate(name="berries")],
+    )
+    created_recipe = await create_recipe_service(recipe_data, db, test_user)
+    # Параллельная запись, о которой загруженный объект не знает
+    await RecipeRepository.bump_versions(db, [created_recipe.id])
+    await db.commit()
+
+    recipe = await update_recipe_service(
+        created_recipe.id, RecipeUpdate(title="Plum jam"), db, test_user
+    )
+
+    assert recipe.version == 3
+
+
+async def test_update_recipe_bumps_ingredients_only_when_created(
+    db: AsyncSession, test_user
+):
+    recipe_data = RecipeCreate(
+        title="Salad",
+        description="Green salad",
+        ingredients=[IngredientCreate(name="lettuce")],
+    )
+    created_recipe = await create_recipe_service(recipe_data, db, test_user)
+    recipes_version, _ = await get_recipes_version(db)
+    ingredients_version, _ = await get_ingredients_version(db)
+
+    await update_recipe_service(
+        created_recipe.id,
+        RecipeUpdate(ingredients=[IngredientCreate(name="lettuce")]),
+        db,
+        test_user,
+    )
+    assert (await get_recipes_version(db))[0] == recipes_version + 1
+    assert (await get_ingredients_version(db))[0] == ingredients_version
+
+    await update_recipe_service(
+        created_recipe.id,
+        RecipeUpdate(ingredients=[IngredientCreate(name="cucumber")]),
+        db,
+        test_user,
+    )
+    assert (await get_ingredients_version(db))[0] == ingredients_version + 1
+
+
 async def test_get_recipe_by_id_not_found(db: AsyncSession):
     with pytest.raises(NotFoundError):
         await get_recipe_by_id(9, db)
@@ -188,3 +409,50 @@ async def test_delete_recipe_service_success(db: AsyncSession, test_user):
 async def test_delete_recipe_service_not_found(db: AsyncSession, test_user):
     with pytest.raises(NotFoundError):
         await delete_recipe_service(9, db, test_user)
+
+
+async def ndjson_stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_import_recipes_service(db: AsyncSession, test_user):
+    stream = ndjson_stream(
+        b'{"title": "Soup", "description": "Hot", "ingredients": [{"name": "Salt"}',
+        b', {"name": "water"}]}\n{"title": "Tea", "description": "Hot",',
+        b' "ingredients": [{"name": "water"}, {"name": "water"}]}\n',
+        b"not json\n\n",
+        b'{"title": "Salad", "description": "Cold", "ingredients": []}',
+    )
+
+    report = await import_recipes_service(stream, db, test_user, chunk_size=2)
+
+    assert report.imported == 3
+    assert report.failed == 1
+    assert report.errors[0].line == 3
+
+    recipes = (await get_recipes_page(db, limit=10)).items
+    assert [recipe.title for recipe in recipes] == ["soup", "tea", "salad"]
+    assert {ing.name for ing in recipes[0].ingredients} == {"salt", "water"}
+    assert [ing.name for ing in recipes[1].ingredients] == ["water"]
+    owners = (await db.execute(select(Recipe.owner_id))).scalars().all()
+    assert owners == [test_user.id] * 3
+
+
+async def test_import_recipes_service_rejects_long_lines(
+    db: AsyncSession, test_user, monkeypatch
+):
+    monkeypatch.setattr(get_settings(), "import_max_line_bytes", 80)
+    stream = ndjson_stream(
+        b'{"title": "Soup", "description": "Hot", "ingredients": []}\n',
+        b'{"title": "Long", "description": "' + b"x" * 60,
+        b"x" * 60,
+        b'", "ingredients": []}\n{"title": "Tea", "description": "Hot",',
+        b' "ingredients": []}\n',
+        b"y" * 100,
+    )
+
+    report = await import_recipes_service(stream, db, test_user, chunk_size=10)
+
+    assert report.imported == 2
+    assert [error.line for error in report.errors] == [2, 4]
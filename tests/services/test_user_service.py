@@ -0,0 +1,161 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from cookbook.core.exceptions import AuthenticationError
+from cookbook.core.security import decode_access_token, hash_refresh_token
+from cookbook.models import Base, User
+from cookbook.models.refresh_token import RefreshToken
+from cookbook.repositories.refresh_token import RefreshTokenRepository
+from cookbook.services.user_service import (
+    refresh_tokens_service,
+    sweep_refresh_tokens,
+)
+
+
+async def add_token(
+    db: AsyncSession, user: User, value: str, expires_in: timedelta
+) -> None:
+    db.add(
+        RefreshToken(
+            token_hash=hash_refresh_token(value),
+            user_id=user.id,
+            expires_at=datetime.utcnow() + expires_in,
+        )
+    )
+    await db.commit()
+
+
+async def test_refresh_tokens_service_rotates(db: AsyncSession, test_user):
+    await add_token(db, test_user, "old", timedelta(days=1))
+
+    access_token, new_value = await refresh_tokens_service(db, "old")
+
+    assert access_token
+    tokens = (await db.execute(select(RefreshToken))).scalars().all()
+    by_hash = {token.token_hash: token for token in tokens}
+    assert by_hash[hash_refresh_token("old")].revoked
+    assert not by_hash[hash_refresh_token(new_value)].revoked
+    assert by_hash[hash_refresh_token(new_value)].user_id == test_user.id
+
+    with pytest.raises(AuthenticationError, match="Invalid refresh token"):
+        await refresh_tokens_service(db, "old")
+
+
+async def test_refresh_tokens_service_expired(db: AsyncSession, test_user):
+    await add_token(db, test_user, "old", timedelta(days=-1))
+
+    with pytest.raises(AuthenticationError, match="Refresh token expired"):
+        await refresh_tokens_service(db, "old")
+    with pytest.raises(AuthenticationError, match="Invalid refresh token"):
+        await refresh_tokens_service(db, "old")
+
+
+async def test_refresh_tokens_service_unknown(db: AsyncSession):
+    with pytest.raises(AuthenticationError, match="Invalid refresh token"):
+        await refresh_tokens_service(db, "missing")
+
+
+async def test_refresh_tokens_service_concurrent_replay(tmp_path):
+    # Файловая база: у каждой сессии своё соединение, как у двух воркеров
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with Session() as db:
+        user = User(email="race@example.com", name="race", password_hash="-")
+        db.add(user)
+        await db.commit()
+        await add_token(db, user, "shared", timedelta(days=1))
+
+    async def attempt():
+        async with Session() as db:
+            return await refresh_tokens_service(db, "shared")
+
+    results = await asyncio.gather(
+        *(attempt() for _ in range(2)), return_exceptions=True
+    )
+
+    succeeded = [r for r in results if not isinstance(r, BaseException)]
+    failed = [r for r in results if isinstance(r, BaseException)]
+    assert len(succeeded) == 1
+    assert len(failed) == 1 and isinstance(failed[0], AuthenticationError)
+
+    async with Session() as db:
+        active = (
+            (
+                await db.execute(
+                    select(RefreshToken).where(RefreshToken.revoked.is_(False))
+                )
+            )
+            .scalars()
+            .all()
+        )
+    assert [token.token_hash for token in active] == [
+        hash_refresh_token(succeeded[0][1])
+    ]
+    await engine.dispose()
+
+
+async def test_refresh_tokens_service_keeps_user_claims(db: AsyncSession, test_user):
+    await add_token(db, test_user, "old", timedelta(days=1))
+
+    access_token, _ = await refresh_tokens_service(db, "old")
+
+    payload = await decode_access_token(access_token)
+    assert payload["sub"] == str(test_user.id)
+    assert payload["email"] == test_user.email
+    assert payload["name"] == test_user.name
+
+
+async def test_sweep_refresh_tokens_keeps_active(db: AsyncSession, test_user):
+    now = datetime.utcnow()
+    for i in range(5):
+        db.add(
+            RefreshToken(
+                token_hash=hash_refresh_token(f"expired-{i}"),
+                user_id=test_user.id,
+                expires_at=now - timedelta(days=1),
+            )
+        )
+        db.add(
+            RefreshToken(
+                token_hash=hash_refresh_token(f"revoked-{i}"),
+                user_id=test_user.id,
+                expires_at=now + timedelta(days=1),
+                revoked=True,
+            )
+        )
+    db.add(
+        RefreshToken(
+            token_hash=hash_refresh_token("active"),
+            user_id=test_user.id,
+            expires_at=now + timedelta(days=1),
+        )
+    )
+    await db.commit()
+
+    assert await sweep_refresh_tokens(db, batch_size=4) == 10
+
+    remaining = (await db.execute(select(RefreshToken.token_hash))).scalars().all()
+    assert remaining == [hash_refresh_token("active")]
+
+
+async def test_sweep_refresh_tokens_skips_when_locked(
+    db: AsyncSession, test_user, monkeypatch
+):
+    await add_token(db, test_user, "expired", timedelta(days=-1))
+
+    async def locked(db):
+        return False
+
+    monkeypatch.setattr(RefreshTokenRepository, "try_lock_sweep", locked)
+
+    assert await sweep_refresh_tokens(db, batch_size=10) == 0
+    tokens = (await db.execute(select(RefreshToken))).scalars().all()
+    assert len(tokens) == 1
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+# Общий бюджет импорта приложения с запасом на медленные CI-машины
+IMPORT_BUDGET_SECONDS = 2.5
+
+# Должны загружаться при первом использовании, а не при импорте
+LAZY_MODULES = {"bcrypt", "jose", "jwt", "asyncpg", "uvicorn"}
+
+
+def profile_import(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line.removeprefix("import time:").split("|")
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def test_main_import_is_lazy_and_within_budget():
+    imported = profile_import("cookbook.main")
+
+    assert LAZY_MODULES.isdisjoint(imported)
+    assert imported["cookbook.main"] / 1_000_000 < IMPORT_BUDGET_SECONDS
+
+
+def test_main_import_does_not_read_settings():
+    # Без переменных окружения Settings() не собрать: импорт обязан
+    # обойтись без него
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith(("POSTGRES_", "JWT_", "REFRESH_"))
+    }
+    code = (
+        "import cookbook.main, settings; "
+        "assert settings.get_settings.cache_info().currsize == 0"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+
+    assert result.returncode == 0, result.stderr